@@ -0,0 +1,247 @@
+import sys
+import json
+import math
+import time
+import types
+import inspect
+import itertools
+import threading
+
+"""
+An offline stand-in for Google Earth Engine's Python API, which records every server call instead of performing it.
+
+Every ee object is an expression node, as in the real API, and only the calls that reach the server in the real API (getInfo,
+getDownloadURL, starting a task, querying task statuses) are recorded, delayed by a configurable latency and answered by a responder.
+"""
+
+
+class EEException(Exception):
+    """The exception raised by the Earth Engine API."""
+
+
+class _Backend:
+    """
+    Description:
+        Records the server calls of the fake Earth Engine API.
+    Arguments:
+        latency (float) (optional): The seconds each server call takes. Defaults to 0.
+    Notes:
+        -The responder is called with the name of the server call and the expression node (or None) and returns the result of the call.
+        -Task statuses are paged by 500, as in the real API, and each id passed to ee.data.getTaskStatus is a separate server call.
+    """
+
+    def __init__(self, latency: float = 0.0):
+        self.latency = latency
+        self.responder = lambda callName, node: None
+        self.calls = []
+        self.tasks = {}
+        self.initialized = False
+        self._lock = threading.Lock()
+        self._taskIds = itertools.count()
+
+    def reset(self):
+        with self._lock:
+            self.calls = []
+            self.tasks = {}
+
+    def call(self, callName: str, node=None, payload=None):
+        """Records a server call, waits for the latency and returns the response of the responder."""
+        payloadBytes = len(node.serialize()) if node is not None else len(json.dumps(payload, default=str))
+        startTime = time.perf_counter()
+        if self.latency:
+            time.sleep(self.latency)
+        response = self.responder(callName, node)
+        with self._lock:
+            self.calls.append({"call": callName, "caller": _caller(), "payloadBytes": payloadBytes, "seconds": time.perf_counter() - startTime})
+        return response
+
+    def new_task_id(self):
+        return "FAKE{:08d}".format(next(self._taskIds))
+
+
+BACKEND = _Backend()
+
+
+def _caller():
+    # the innermost geetils function on the stack, outside of the initialization helpers.
+    frame = sys._getframe(2)
+    while frame is not None:
+        moduleName = frame.f_globals.get("__name__", "")
+        if moduleName.startswith("geetils") and moduleName != "geetils.initialization":
+            return "{}.{}".format(moduleName, frame.f_code.co_name)
+        frame = frame.f_back
+    return None
+
+
+class ComputedObject:
+    """
+    Description:
+        An expression node: the application of a server-side function to arguments.
+    Notes:
+        -Any attribute is a method which returns a new node, with the node itself as first argument.
+        -Python callables passed as arguments (e.g. to map or iterate) are invoked once with variable nodes, as the real API does.
+    """
+
+    def __init__(self, function: str, args: tuple = (), kwargs: dict = None):
+        self.function = function
+        self.args = tuple(_function_node(arg) if callable(arg) and not isinstance(arg, ComputedObject) else arg for arg in args)
+        self.kwargs = {key: _function_node(value) if callable(value) and not isinstance(value, ComputedObject) else value
+                       for key, value in (kwargs or {}).items()}
+
+    def __getattr__(self, name: str):
+        if name.startswith("__"):
+            raise AttributeError(name)
+        return lambda *args, **kwargs: ComputedObject(name, (self,) + args, kwargs)
+
+    def getInfo(self):
+        return BACKEND.call("getInfo", self)
+
+    def getDownloadURL(self, params=None):
+        return BACKEND.call("getDownloadURL", ComputedObject("getDownloadURL", (self, params)))
+
+    def serialize(self):
+        """Returns the expression as JSON, with every distinct node listed once, like the real API's compact serialization."""
+        values = {}
+        references = {}
+
+        def _encode(value):
+            if isinstance(value, ComputedObject):
+                if id(value) not in references:
+                    references[id(value)] = str(len(references))
+                    values[references[id(value)]] = {
+                        "function": value.function,
+                        "args": [_encode(arg) for arg in value.args],
+                        "kwargs": {key: _encode(item) for key, item in value.kwargs.items()}
+                    }
+                return {"valueReference": references[id(value)]}
+            if isinstance(value, (list, tuple)):
+                return [_encode(item) for item in value]
+            if isinstance(value, dict):
+                return {str(key): _encode(item) for key, item in value.items()}
+            return value
+
+        result = _encode(self)
+        return json.dumps({"values": values, "result": result}, default=str, sort_keys=True)
+
+    # the nodes are compared by identity, as in the real API.
+    __hash__ = object.__hash__
+
+
+def _function_node(function):
+    parameters = [parameter for parameter in inspect.signature(function).parameters.values()
+                  if parameter.default is inspect.Parameter.empty and parameter.kind == inspect.Parameter.POSITIONAL_OR_KEYWORD]
+    # variables are named after the nesting depth of the function, as in the real API, so that equal expressions serialize equally.
+    depth = _FUNCTION_DEPTH.__dict__.setdefault("value", 0)
+    variables = [ComputedObject("variable", ("_MAPPING_VAR_{}_{}".format(depth, index),)) for index in range(len(parameters))]
+    _FUNCTION_DEPTH.value = depth + 1
+    try:
+        body = function(*variables)
+    finally:
+        _FUNCTION_DEPTH.value = depth
+    return ComputedObject("function", tuple(variables) + (body,))
+
+
+_FUNCTION_DEPTH = threading.local()
+
+
+class _Namespace:
+    """A type of the API (e.g. ee.Image): calling it constructs a node and its attributes are static methods."""
+
+    def __init__(self, name: str):
+        self.name = name
+
+    def __call__(self, *args, **kwargs):
+        return ComputedObject(self.name, args, kwargs)
+
+    def __getattr__(self, name: str):
+        if name.startswith("__"):
+            raise AttributeError(name)
+        qualifiedName = "{}.{}".format(self.name, name)
+        return lambda *args, **kwargs: ComputedObject(qualifiedName, args, kwargs)
+
+
+class _Task:
+    """An export task, which is only submitted to the server when started."""
+
+    def __init__(self, taskType: str, image, config: dict):
+        self.id = None
+        self.taskType = taskType
+        self.image = image
+        self.config = config
+
+    def start(self):
+        BACKEND.call("Task.start", ComputedObject(self.taskType, (self.image,), {"description": self.config.get("description")}))
+        self.id = BACKEND.new_task_id()
+        timestamp = int(time.time() * 1000)
+        BACKEND.tasks[self.id] = {"id": self.id, "state": "COMPLETED", "task_type": "EXPORT_IMAGE", "attempt": 1,
+                                  "description": self.config.get("description"), "creation_timestamp_ms": timestamp,
+                                  "start_timestamp_ms": timestamp, "update_timestamp_ms": timestamp}
+
+    def cancel(self):
+        BACKEND.call("Task.cancel", payload=self.id)
+        BACKEND.tasks[self.id]["state"] = "CANCELLED"
+
+    def status(self):
+        return ee.data.getTaskStatus(self.id)[0]
+
+
+def _get_task_status(taskId):
+    taskIdsList = [taskId] if isinstance(taskId, str) else list(taskId)
+    result = []
+    for oneId in taskIdsList:
+        # the real API sends one request per task id.
+        BACKEND.call("getTaskStatus", payload=oneId)
+        result.append(BACKEND.tasks.get(oneId, {"id": oneId, "state": "UNKNOWN"}))
+    return result
+
+
+def _get_task_list():
+    for _ in range(max(1, math.ceil(len(BACKEND.tasks) / 500))):
+        BACKEND.call("listOperations", payload={"pageSize": 500})
+    return list(BACKEND.tasks.values())
+
+
+def _initialize(*args, **kwargs):
+    BACKEND.call("Initialize", payload=kwargs)
+    BACKEND.initialized = True
+
+
+def _is_initialized():
+    return BACKEND.initialized
+
+
+def install(latency: float = 0.0):
+    """
+    Description:
+        Registers the fake module as "ee", so that importing geetils afterwards uses it, and returns its backend.
+    Arguments:
+        latency (float) (optional): The seconds each server call takes. Defaults to 0.
+    Notes:
+        -Must be called before geetils is imported.
+    """
+    BACKEND.latency = latency
+    sys.modules["ee"] = ee
+    return BACKEND
+
+
+class _FakeModule(types.ModuleType):
+
+    def __getattr__(self, name: str):
+        if name.startswith("__"):
+            raise AttributeError(name)
+        namespace = _Namespace(name)
+        setattr(self, name, namespace)
+        return namespace
+
+
+ee = _FakeModule("ee")
+ee.__file__ = __file__
+ee.EEException = EEException
+ee.ComputedObject = ComputedObject
+ee.Initialize = _initialize
+ee.data = types.SimpleNamespace(getTaskStatus=_get_task_status, getTaskList=_get_task_list, is_initialized=_is_initialized)
+ee.batch = types.SimpleNamespace(Export=types.SimpleNamespace(image=types.SimpleNamespace(
+    toAsset=lambda image, description=None, **kwargs: _Task("Export.image.toAsset", image, dict(kwargs, description=description)),
+    toDrive=lambda image, description=None, **kwargs: _Task("Export.image.toDrive", image, dict(kwargs, description=description)),
+    toCloudStorage=lambda image, description=None, **kwargs: _Task("Export.image.toCloudStorage", image, dict(kwargs, description=description))
+)))
@@ -0,0 +1,232 @@
+import io
+import os
+import sys
+import json
+import time
+import argparse
+import tempfile
+import threading
+import contextlib
+import http.server
+import fake_ee
+
+"""
+Benchmarks the entry points of geetils against the offline stand-in for Earth Engine (see fake_ee.py).
+
+For each entry point the table reports the number of server round trips, the total size of the request payloads and the wall time.
+Graph-building entry points (composites, date ranges, masks) are evaluated with a single getInfo, so their request size is the size of
+the graph they build.
+
+Usage:
+    python benchmarks/run.py [--images 100] [--latency 0.01] [--output results.json]
+"""
+
+BACKEND = fake_ee.install()
+os.environ.setdefault("TQDM_DISABLE", "1")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import ee  # noqa: E402 (the fake module, registered by fake_ee.install)
+import numpy  # noqa: E402
+import tabulate  # noqa: E402
+from geetils import common, date, masking  # noqa: E402
+from geetils.batch import image, imagecollection  # noqa: E402
+
+DOWNLOAD_SIZE = 256 * 1024  # bytes served per downloaded image.
+
+
+class _DownloadHandler(http.server.BaseHTTPRequestHandler):
+    """Serves DOWNLOAD_SIZE bytes for any path, honouring Range requests."""
+
+    def log_message(self, *args):
+        pass
+
+    def do_GET(self):
+        if self.path.startswith("/npy/"):
+            # an NPY download of the requested dimensions, with two bands.
+            width, height = [int(value) for value in self.path.split("/")[-1].split("x")]
+            buffer = io.BytesIO()
+            numpy.save(buffer, numpy.zeros((height, width), dtype=[("B2", "<f4"), ("B3", "<f4")]))
+            self.send_response(200)
+            self.send_header("content-length", str(buffer.tell()))
+            self.end_headers()
+            self.wfile.write(buffer.getvalue())
+            return
+
+        offset = 0
+        if self.headers.get("Range"):
+            offset = int(self.headers["Range"].split("=")[1].rstrip("-"))
+            self.send_response(206)
+        else:
+            self.send_response(200)
+        self.send_header("content-length", str(DOWNLOAD_SIZE - offset))
+        self.end_headers()
+        try:
+            self.wfile.write(b"\0" * (DOWNLOAD_SIZE - offset))
+        except ConnectionError:
+            pass
+
+
+def _responder_creator(numberOfImages: int, downloadUrl: str):
+    """
+    Description:
+        Returns a responder that answers the server calls of geetils with plausible results for a collection of numberOfImages images.
+    Arguments:
+        numberOfImages  (int)   (mandatory): Self-explanatory.
+        downloadUrl     (str)   (mandatory): The url returned by getDownloadURL.
+    Notes:
+        None.
+    """
+    def _responder(callName: str, node):
+        if callName == "getDownloadURL":
+            params = node.args[1] or {}
+            if params.get("format") == "NPY":
+                return "{}/npy/{}".format(downloadUrl.rsplit("/", 1)[0], params["dimensions"])
+            return downloadUrl
+        if callName != "getInfo":
+            return None
+
+        if node.function == "aggregate_array" and node.args[1] == "geetils_metadata":
+            return [["image_{}".format(counter), "{:05d}".format(counter), ["B2", "B3", "B4", "QA60"]] for counter in range(numberOfImages)]
+        if node.function == "List" and isinstance(node.args[0], list) and len(node.args[0]) == 2:
+            # the sensor detection of the collection masking: a merged landsat collection.
+            return [None, ["B1", "B2", "B3", "pixel_qa"]]
+        if node.function == "reduceColumns":
+            # the coverage tables: ten groups sharing the images of the collection.
+            return {"groups": [{"group": group, "list": [["T{:02d}".format(counter % 5), 1546300800000 + counter * 432000000]
+                                                         for counter in range(group, numberOfImages, 10)]} for group in range(10)]}
+        if node.function == "size":
+            return numberOfImages
+        if node.function == "distinct":
+            return list(range(10))
+        if node.function in ["map", "sort"]:
+            return [["2020-01-{:02d}".format(day) for day in range(1, 11)] for _ in range(10)]
+        return None
+
+    return _responder
+
+
+def _benchmark_cases(numberOfImages: int, downloadPath: str):
+    """
+    Description:
+        Returns a list of (entry point name, callable) pairs. A callable may return an ee object, which is then evaluated with getInfo.
+    Arguments:
+        numberOfImages  (int)   (mandatory): The number of images of the benchmarked collections and of the date ranges.
+        downloadPath    (str)   (mandatory): The directory to download images to.
+    Notes:
+        None.
+    """
+    collection = ee.ImageCollection("COPERNICUS/S2").filterDate("2019-01-01", "2021-01-01")
+    firstDates = ["2019-01-{:02d}".format(1 + counter % 28) for counter in range(numberOfImages)]
+    firstDatesList = ee.List(firstDates)
+    secondDatesList = ee.List(["2019-02-{:02d}".format(1 + counter % 28) for counter in range(numberOfImages)])
+    kwargs = {"scale": 10, "region": [[0, 0], [0, 1], [1, 1]]}
+    exportTasksIdsList = []
+
+    def _asset_exporter():
+        exportTasksIdsList.extend(imagecollection._collection_to_asset_exporter(collection, "float", {"assetId": "users/geetils/image"}))
+
+    maskingFunctions = [masking._sentinel2_qa, masking._sentinel2_sr, masking._landsat457_toa, masking._cloud_qa_landsat457_sr,
+                        masking._pixel_qa_landsat457_sr, masking._landsat8_toa, masking._landsat8_sr]
+
+    cases = [
+        ("common._temporal_collection_creator", lambda: common._temporal_collection_creator(collection, "median", firstDatesList, secondDatesList)),
+        ("common._temporal_collection_creator (mean, median, min)",
+         lambda: common._temporal_collection_creator(collection, ["mean", "median", "min"], firstDatesList, secondDatesList)),
+        ("common._spatial_interpolation (pyramidLevels=4)",
+         lambda: common._spatial_interpolation(collection.median(), pyramidLevels=4, projection=ee.Projection("EPSG:4326").atScale(10))),
+        ("common._temporal_gap_filling", lambda: common._temporal_gap_filling(collection, 30, "day")),
+        ("date._acquisition_date_extractor", lambda: date._acquisition_date_extractor(collection, "system:time_start")),
+        ("date._acquisition_date_extractor (day level)", lambda: date._acquisition_date_extractor(collection, "system:time_start", dayLevel=True)),
+        ("date._date_range_creator_from_dates", lambda: date._date_range_creator_from_dates(ee.Date("2018-01-01"), ee.Date("2021-01-01"), 1, "week")),
+        ("date._date_range_creator_from_dates (client)", lambda: date._date_range_creator_from_dates("2018-01-01", "2021-01-01", 1, "week")),
+        ("date._date_range_creator_from_list", lambda: date._date_range_creator_from_list(firstDatesList, 1, "month")),
+        ("date._date_range_creator_from_list (client)", lambda: date._date_range_creator_from_list(firstDates, 1, "month")),
+    ]
+    for maskingFunction in maskingFunctions:
+        cases.append(("masking.{}".format(maskingFunction.__name__),
+                      lambda maskingFunction=maskingFunction: collection.map(
+                          lambda image: masking._cloud_mask_application(maskingFunction(image), image, 0))))
+    cases += [
+        ("masking._collection_cloud_mask_application", lambda: masking._collection_cloud_mask_application(collection, nonValue=0)),
+        ("common._sentinel2_coverage", lambda: common._sentinel2_coverage(collection)),
+        ("common._landsat_coverage", lambda: common._landsat_coverage(collection)),
+        ("imagecollection._collection_to_asset_exporter", _asset_exporter),
+        ("imagecollection._collection_to_drive_exporter", lambda: imagecollection._collection_to_drive_exporter(collection, "float", {"folder": "geetils"})),
+        ("imagecollection._collection_to_cloud_storage_exporter",
+         lambda: imagecollection._collection_to_cloud_storage_exporter(collection, "float", {"bucket": "geetils"})),
+        ("imagecollection._collection_to_local_hard_drive_exporter",
+         lambda: imagecollection._collection_to_local_hard_drive_exporter(collection, downloadPath, **kwargs)),
+        ("image._image_to_local_hard_drive_tiled_exporter (no mosaic)",
+         lambda: image._image_to_local_hard_drive_tiled_exporter(ee.Image("COPERNICUS/S2/20190101"), {"scale": 30, "region": [[0, 0], [1, 1]]},
+                                                                  downloadPath, "tiled", bytesPerPixel=32, mosaic=False)),
+        ("image._image_to_numpy_fetcher",
+         lambda: image._image_to_numpy_fetcher(ee.Image("COPERNICUS/S2/20190101"), [[0, 0], [1, 1]], 30, bytesPerPixel=32)),
+        ("common._export_tasks_viewer", lambda: common._export_tasks_viewer(exportTasksIdsList)),
+    ]
+    return cases
+
+
+def _run(numberOfImages: int, latency: float):
+    """
+    Description:
+        Runs every benchmark case and returns a list of dictionaries with the keys "entryPoint", "roundTrips", "requestBytes", "seconds"
+        and "error".
+    Arguments:
+        numberOfImages  (int)   (mandatory): Self-explanatory.
+        latency         (float) (mandatory): The seconds each server call takes.
+    Notes:
+        -The initialization of Earth Engine is performed, and excluded, before the first case.
+    """
+    server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), _DownloadHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    downloadUrl = "http://127.0.0.1:{}/download".format(server.server_address[1])
+
+    BACKEND.responder = _responder_creator(numberOfImages, downloadUrl)
+    results = []
+
+    with tempfile.TemporaryDirectory() as downloadPath:
+        common.initialization._initialize()
+        cases = _benchmark_cases(numberOfImages, downloadPath)
+        BACKEND.latency = latency
+
+        for entryPoint, case in cases:
+            BACKEND.calls = []
+            error = None
+            startTime = time.perf_counter()
+            with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+                try:
+                    result = case()
+                    if isinstance(result, ee.ComputedObject):
+                        result.getInfo()
+                except Exception as exception:
+                    # a failing entry point is reported, not fatal to the rest of the suite.
+                    error = "{}: {}".format(type(exception).__name__, exception)
+            seconds = time.perf_counter() - startTime
+
+            results.append({"entryPoint": entryPoint, "roundTrips": len(BACKEND.calls),
+                            "requestBytes": sum(call["payloadBytes"] for call in BACKEND.calls), "seconds": seconds, "error": error})
+
+    server.shutdown()
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmarks geetils against an offline stand-in for Earth Engine.")
+    parser.add_argument("--images", type=int, default=100, help="The number of images of the benchmarked collections.")
+    parser.add_argument("--latency", type=float, default=0.01, help="The seconds each server call takes.")
+    parser.add_argument("--output", default=None, help="A path to also write the results to, as JSON.")
+    arguments = parser.parse_args()
+
+    results = _run(arguments.images, arguments.latency)
+
+    table = [[result["entryPoint"], result["roundTrips"], result["requestBytes"], "{:.3f}".format(result["seconds"]), (result["error"] or "")[:60]]
+             for result in results]
+    print(tabulate.tabulate(table, headers=["Entry_Point", "Round_Trips", "Request_Bytes", "Wall_Time_s", "Error"]))
+
+    if arguments.output is not None:
+        with open(arguments.output, "w") as file:
+            json.dump({"images": arguments.images, "latency": arguments.latency, "results": results}, file, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,15 +1,35 @@
 import ee
 import os
+import math
+import time
 import tqdm
+import shutil
 import requests
+import zipfile
+import threading
+import concurrent.futures
+from .. import initialization
+from .. import instrumentation
 
 
 """
 Utilizing the static methods of Google Earth Engine's Python API this module includes functions to handle the process of exporting image collections.
 """
 
+# the limits of a single getDownloadURL request: the uncompressed size in bytes and the width or height in pixels.
+DOWNLOAD_REQUEST_SIZE_LIMIT = 32 * 1024 * 1024
+DOWNLOAD_GRID_DIMENSION_LIMIT = 10000
 
-def _image_to_local_hard_drive_exporter(image, kwargs: dict, path: str = None, extension: str = 'zip'):
+# the part of the messages with which getDownloadURL rejects a request over its size or grid dimension limit.
+DOWNLOAD_LIMIT_ERROR_PATTERN = "must be less than or equal to"
+
+# meters per degree of latitude, and of longitude at the equator.
+METERS_PER_DEGREE = 111320
+
+
+@initialization._ensure_initialized
+def _image_to_local_hard_drive_exporter(image, kwargs: dict, path: str = None, extension: str = 'zip', progressBar=None, resume: bool = False,
+                                        description: str = None, ingest: bool = False, tiled: bool = None):
     """
     Description:
         Creates a batch task to export an image as a raster to the local hard drive.
@@ -20,6 +40,12 @@ def _image_to_local_hard_drive_exporter(image, kwargs: dict, path: str = None, e
         bandType    (str)       (mandatory): A dictionary from band name to band types.
         bandOrder   (list)      (optional):  A list specifying the order of the bands in the result.
         kwargs      (dict)      (optional):  Dictionary of optional parameters.
+        progressBar (tqdm.tqdm) (optional):  A shared progress bar to report the downloaded bytes to. Defaults to None.
+        resume      (bool)      (optional):  Whether to resume interrupted downloads and skip completed ones. Defaults to False.
+        description (str)       (optional):  The already retrieved "description" property of the image. Defaults to None.
+        ingest      (bool)      (optional):  Whether to write the bands of the zip into a memory-mapped array. Defaults to False.
+        tiled       (bool)      (optional):  Whether to download the image in tiles (see _image_to_local_hard_drive_tiled_exporter).
+                                             Defaults to None, which falls back to tiles only if the request is over its limits.
     Notes:
         -The argument bandType must be one of: 'int8', 'int16', 'int32', 'int64', 'uint8', 'uint16',
         'uint32', 'byte', 'short', 'int', 'long', 'float' and 'double'.
@@ -30,6 +56,22 @@ def _image_to_local_hard_drive_exporter(image, kwargs: dict, path: str = None, e
         -If the path value is not defined the image will be downloaded to the same folder as the script.
         -The function does not check for the validity of the provided options so caution needs to be exercised.
         -The following is an example value for the extension argument(e.g. type 'zip' and not '.zip').
+        -If the argument progressBar is not specified a progress bar is created for the image alone.
+        -If the argument description is not specified it is retrieved from the server.
+        -If the argument resume is True the image is downloaded to a "<description>.<extension>.part" file, which is renamed once its size
+        matches the content-length of the response. An existing partial file is continued with an HTTP Range request, if the server
+        supports it, and an existing final file whose size matches the content-length is not downloaded again.
+        -The validator of the response (its strong ETag, else its Last-Modified) is kept in a "<description>.<extension>.part.validator"
+        file and sent as If-Range when continuing, so the server sends the whole content again if it has changed. A continued zip is
+        also checked with zipfile.ZipFile.testzip before being renamed, and is deleted if corrupt, so the next attempt starts over.
+        -If the argument ingest is True the downloaded zip is written into "<description>.npy" with a "<description>.json" sidecar (see
+        local._zip_to_memory_map), which local._memory_map_loader opens without loading the pixels. A skipped download whose array
+        exists is not ingested again.
+        -If the argument tiled is True, or None and getDownloadURL rejects the request as over DOWNLOAD_REQUEST_SIZE_LIMIT or
+        DOWNLOAD_GRID_DIMENSION_LIMIT, the image is downloaded in tiles mosaicked into "<description>.tif", whatever the extension. This
+        needs the "region" and "scale" parameters and cannot be combined with the argument ingest, as the mosaic is not a zip.
+        -Returns a dictionary with the keys "path", "bytes" (transferred), "duration" (in seconds) and "skipped" of the download, plus
+        "arrayPath" if the argument ingest is True and "tiles" if the image was downloaded in tiles.
 
         Quick overview of what each status code means:
         1XX - Information
@@ -38,47 +80,482 @@ def _image_to_local_hard_drive_exporter(image, kwargs: dict, path: str = None, e
         4XX - Client Error (you messed up)
         5XX - Server Error (they messed up)
     """
-    if not bool(kwargs) or image.get("description").getInfo() is None:
+    if tiled and ingest:
+        raise ValueError("A tiled download is mosaicked into a GeoTIFF, which cannot be ingested")
+
+    if tiled:
+        # the description is retrieved along with the bounds of the region, if needed.
+        return _image_to_local_hard_drive_tiled_exporter(image, kwargs, path, description, progressBar=progressBar, resume=resume)
+
+    if ingest:
+        # the local module imports rasterio, hence only the downloads that are ingested import it.
+        from .. import local
+
+    startTime = time.time()
+    if description is None:
+        description = instrumentation._get_info(image.get("description"))
+
+    if not bool(kwargs) or description is None:
         raise ValueError("Either an image does not have a description property or no parameters were specified for the image export task")
 
     if path is None:
         path = os.getcwd()
 
+    filePath = os.path.join(path, '{}.{}'.format(description, extension))
+    partialFilePath = '{}.part'.format(filePath)
+    validatorFilePath = '{}.validator'.format(partialFilePath)
+
     # get the url
-    url = image.getDownloadURL(kwargs)
+    try:
+        url = instrumentation._get_download_url(image, kwargs)
+    except ee.EEException as error:
+        if tiled is not None or ingest or "region" not in kwargs or "scale" not in kwargs or DOWNLOAD_LIMIT_ERROR_PATTERN not in str(error):
+            raise
+        # the request is over the limits of a single download, hence the image is downloaded in tiles instead.
+        return _image_to_local_hard_drive_tiled_exporter(image, kwargs, path, description, progressBar=progressBar, resume=resume)
+
+    if resume and os.path.isfile(filePath):
+        # only the headers are fetched, the body of the response is never read.
+        response = _download_request(url)
+        fileSize = int(response.headers.get('content-length', 0))
+        response.close()
+
+        # a final file only ever appears by renaming a complete partial file, hence an unknown size is taken on trust.
+        if fileSize == 0 or fileSize == os.path.getsize(filePath):
+            result = {"path": filePath, "bytes": 0, "duration": time.time() - startTime, "skipped": True}
+            if ingest:
+                arrayPath = os.path.join(path, '{}.npy'.format(description))
+                result["arrayPath"] = arrayPath if os.path.isfile(arrayPath) else local._zip_to_memory_map(filePath, arrayPath)
+            return result
+
+    # continue a partial download from where it was left off, provided that the content has not changed since.
+    offset = 0
+    validator = None
+    if resume and os.path.isfile(partialFilePath):
+        offset = os.path.getsize(partialFilePath)
+        if os.path.isfile(validatorFilePath):
+            with open(validatorFilePath) as file:
+                validator = file.read() or None
+
+    response = _download_request(url, offset, validator)
+
+    # the server honours the range request only if it responds with 206 (Partial Content), else the download starts over.
+    if response.status_code != 206:
+        offset = 0
+
+    if resume and not offset:
+        # the validator of the content the partial file is about to hold, if the server provides one.
+        validator = _response_validator(response)
+        with open(validatorFilePath, 'w') as file:
+            file.write(validator or '')
+
+    fileSize = offset + int(response.headers.get('content-length', 0))  # Total size in bytes.
+
+    blockSize = 1024 * 1024  # 1 MB
 
-    # request data
+    if progressBar is None:
+        fileProgressBar = tqdm.tqdm(total=fileSize, initial=offset, desc=description, unit='B', unit_scale=True, unit_divisor=1024, position=1,
+                                    leave=True)
+    else:
+        # the progress bar is shared among concurrent downloads, thus its total grows as each download starts.
+        fileProgressBar = progressBar
+        with fileProgressBar.get_lock():
+            fileProgressBar.total += fileSize - offset
+            fileProgressBar.refresh()
+
+    fileBytes = 0
+
+    # write the contents of the variable into a file, appending to the partial file when resuming.
+    with open(partialFilePath if resume else filePath, 'ab' if offset else 'wb') as file:
+        try:
+            with instrumentation._server_call("download") as record:
+                for block in response.iter_content(blockSize):
+                    file.write(block)
+                    fileBytes += len(block)
+                    record["bytes"] = fileBytes
+                    with fileProgressBar.get_lock():
+                        fileProgressBar.update(len(block))
+        except requests.exceptions.RequestException as error:
+            raise SystemExit(error)
+        finally:
+            response.close()
+
+    if progressBar is None:
+        fileProgressBar.close()
+
+    if resume:
+        # the partial file is kept for the next attempt unless its size matches the expected one.
+        if fileSize > offset and os.path.getsize(partialFilePath) != fileSize:
+            raise SystemExit("Incomplete download of {}: expected {} bytes, got {}".format(description, fileSize, os.path.getsize(partialFilePath)))
+
+        # a continued zip is spliced from two responses, which a matching size alone does not prove to be of the same content.
+        if offset and extension == 'zip' and not _zip_validator(partialFilePath):
+            os.remove(partialFilePath)
+            if os.path.isfile(validatorFilePath):
+                os.remove(validatorFilePath)
+            raise SystemExit("Corrupt download of {}: the content changed since the partial file was written".format(description))
+
+        os.replace(partialFilePath, filePath)
+        if os.path.isfile(validatorFilePath):
+            os.remove(validatorFilePath)
+
+    result = {"path": filePath, "bytes": fileBytes, "duration": time.time() - startTime, "skipped": False}
+    if ingest:
+        result["arrayPath"] = local._zip_to_memory_map(filePath, os.path.join(path, '{}.npy'.format(description)))
+    return result
+
+
+def _download_request(url: str, offset: int = 0, validator: str = None):
+    """
+    Description:
+        Returns the streamed response of a GET request, asking for the content from the provided byte offset onwards.
+    Arguments:
+        url         (str)   (mandatory): Self-explanatory.
+        offset      (int)   (optional):  The byte offset to request the content from. Defaults to 0.
+        validator   (str)   (optional):  The ETag or Last-Modified of the content the offset refers to. Defaults to None.
+    Notes:
+        -For a non-zero offset an HTTP Range header is sent. Servers that do not support it respond with the full content.
+        -With a validator an If-Range header is sent as well, so that the server responds with the full content if it has changed.
+    """
+    headers = {"Range": "bytes={}-".format(offset)} if offset else {}
+    if offset and validator:
+        headers["If-Range"] = validator
+
+    # request data, streaming the response body instead of holding it in memory.
     try:
-        response = requests.get(url)
+        with instrumentation._server_call("requests.get"):
+            response = requests.get(url, headers=headers, stream=True)
+            if response.status_code == 416:
+                # the offset lies beyond the content, thus the partial file cannot be trusted and the whole content is requested.
+                response.close()
+                response = requests.get(url, stream=True)
         response.raise_for_status()  # If the response was successful, no Exception will be raised
     except requests.exceptions.HTTPError as error:
         raise SystemExit(error)
     except requests.exceptions.RequestException as error:
         raise SystemExit(error)
 
-    fileSize = int(response.headers.get('content-length', 0))  # Total size in bytes.
+    return response
+
+
+def _response_validator(response):
+    # a strong ETag, else the Last-Modified date, as weak ETags are not allowed in If-Range.
+    eTag = response.headers.get('ETag')
+    if eTag and not eTag.startswith('W/'):
+        return eTag
+    return response.headers.get('Last-Modified')
+
+
+def _zip_validator(zipPath: str):
+    # whether the zip can be read and the CRC of every member matches.
+    try:
+        with zipfile.ZipFile(zipPath) as file:
+            return file.testzip() is None
+    except zipfile.BadZipFile:
+        return False
+
+
+@initialization._ensure_initialized
+def _image_to_local_hard_drive_tiled_exporter(image, kwargs: dict, path: str = None, description: str = None, bytesPerPixel: int = None,
+                                              maxWorkers: int = 4, retries: int = 3, mosaic: bool = True, progressBar=None, resume: bool = False):
+    """
+    Description:
+        Downloads an image over a region too large for a single request as a grid of GeoTIFF tiles and mosaics them into one raster.
+    Arguments:
+        image           (ee.Image)  (mandatory): The image to export.
+        kwargs          (dict)      (mandatory): Dictionary of parameters of getDownloadURL, including "region" and "scale".
+        path            (str)       (optional):  The path to download the image. Defaults to None.
+        description     (str)       (optional):  The already retrieved "description" property of the image. Defaults to None.
+        bytesPerPixel   (int)       (optional):  The bytes of a pixel across all bands. Defaults to 8 per band.
+        maxWorkers      (int)       (optional):  The maximum number of concurrent tile downloads. Defaults to 4.
+        retries         (int)       (optional):  The number of times a failed tile is downloaded again. Defaults to 3.
+        mosaic          (bool)      (optional):  Whether to mosaic the tiles into "<description>.tif". Defaults to True.
+        progressBar     (tqdm.tqdm) (optional):  A shared progress bar to report the downloaded bytes to. Defaults to None.
+        resume          (bool)      (optional):  Whether to skip the download if the mosaic already exists. Defaults to False.
+    Notes:
+        -The region (an ee.Geometry, a GeoJSON dictionary or a list of coordinates in EPSG:4326) is split along its bounds into tiles of
+        at most DOWNLOAD_REQUEST_SIZE_LIMIT bytes and DOWNLOAD_GRID_DIMENSION_LIMIT pixels a side, at the latitude where a degree of
+        longitude is the longest, so that every tile stays under the limits of getDownloadURL.
+        -The description, band count and bounds of a server-side region, when needed, are retrieved in a single getInfo.
+        -Tiles are downloaded resumably to "<description>_tiles", so a retried tile only transfers its missing bytes and re-running a
+        failed export skips the tiles already downloaded. The directory is removed once the mosaic is written.
+        -Tiles are mosaicked with rasterio.merge, the first tile winning where tiles overlap by a pixel. The mosaic is written to
+        "<description>.tif.part" and renamed once complete, so an existing "<description>.tif" is always whole and, if the argument resume
+        is True, is not downloaded again.
+        -Returns a dictionary with the keys "path" (the mosaic, or None if mosaic is False), "tiles" (the tile paths), "bytes",
+        "duration" and "skipped", and raises a SystemExit listing the tiles that still failed after their retries.
+    """
+    startTime = time.time()
+    region = kwargs.get("region")
+    scale = kwargs.get("scale")
+    if region is None or scale is None:
+        raise ValueError("A tiled download requires the region and scale parameters")
+
+    if path is None:
+        path = os.getcwd()
+
+    def _skipped_result(mosaicDescription):
+        # the mosaic is only ever renamed into place once complete, hence an existing one is taken as is.
+        mosaicPath = os.path.join(path, '{}.tif'.format(mosaicDescription))
+        if resume and mosaic and os.path.isfile(mosaicPath):
+            return {"path": mosaicPath, "tiles": [], "bytes": 0, "duration": time.time() - startTime, "skipped": True}
+        return None
+
+    # a known description spares the retrieval of the bounds of an existing mosaic.
+    skippedResult = _skipped_result(description) if description is not None else None
+    if skippedResult is not None:
+        return skippedResult
+
+    bounds = _region_bounds_creator(region)
+    bandCount = image.bandNames().size() if bytesPerPixel is None else bytesPerPixel
+    imageDescription = image.get("description") if description is None else description
+
+    # retrieve whatever is not known on the client in a single round trip.
+    if any(isinstance(value, ee.ComputedObject) for value in [bounds, bandCount, imageDescription]):
+        bounds, bandCount, imageDescription = instrumentation._get_info(ee.List([bounds, bandCount, imageDescription]))
+    bytesPerPixel = 8 * bandCount if bytesPerPixel is None else bytesPerPixel
+    description = imageDescription
+
+    if description is None:
+        raise ValueError("An image does not have a description property")
+
+    skippedResult = _skipped_result(description)
+    if skippedResult is not None:
+        return skippedResult
+
+    tilesPath = os.path.join(path, '{}_tiles'.format(description))
+    os.makedirs(tilesPath, exist_ok=True)
+
+    tiles = _tile_grid_creator(bounds, scale, bytesPerPixel)
+
+    ownProgressBar = progressBar is None
+    if ownProgressBar:
+        progressBar = tqdm.tqdm(total=0, desc="Downloading {} tiles".format(len(tiles)), unit='B', unit_scale=True, unit_divisor=1024, leave=True)
+
+    def _inner_function(tile):
+        row, column, rectangle = tile
+        tileKwargs = dict(kwargs, region=ee.Geometry.Rectangle(rectangle, "EPSG:4326", False), format="GEO_TIFF", filePerBand=False)
+        tileDescription = '{}_{}_{}'.format(description, row, column)
+        for attempt in range(retries + 1):
+            try:
+                return _image_to_local_hard_drive_exporter(image, tileKwargs, tilesPath, 'tif', progressBar, True, tileDescription, tiled=False)
+            except (Exception, SystemExit) as error:
+                if attempt == retries:
+                    return {"path": None, "bytes": 0, "error": "{}: {}".format(tileDescription, error)}
+                time.sleep(2 ** attempt)
+
+    # the downloads are bound by the network and not by the interpreter, thus threads suffice.
+    with concurrent.futures.ThreadPoolExecutor(max_workers=maxWorkers) as executor:
+        tileReport = list(executor.map(_inner_function, tiles))
+
+    if ownProgressBar:
+        progressBar.close()
+
+    failedTiles = [result["error"] for result in tileReport if result["path"] is None]
+    if failedTiles:
+        raise SystemExit("{} of {} tiles failed: {}".format(len(failedTiles), len(tiles), "; ".join(failedTiles)))
+
+    tilePaths = [result["path"] for result in tileReport]
+    filePath = None
+    if mosaic:
+        # rasterio is only imported by the downloads that need a mosaic, so that importing this module stays cheap.
+        import rasterio.merge
+
+        filePath = os.path.join(path, '{}.tif'.format(description))
+        partialFilePath = '{}.part'.format(filePath)
+        rasterio.merge.merge(tilePaths, dst_path=partialFilePath, dst_kwds={"driver": "GTiff"})
+        os.replace(partialFilePath, filePath)
+        shutil.rmtree(tilesPath)
+
+    return {"path": filePath, "tiles": tilePaths, "bytes": sum(result["bytes"] for result in tileReport), "duration": time.time() - startTime,
+            "skipped": False}
+
+
+def _tile_grid_creator(bounds: list, scale: float, bytesPerPixel: int, maxBytes: int = DOWNLOAD_REQUEST_SIZE_LIMIT,
+                       maxDimension: int = DOWNLOAD_GRID_DIMENSION_LIMIT):
+    """
+    Description:
+        Returns a list of (row, column, [west, south, east, north]) tiles covering the bounds, each under the request limits.
+    Arguments:
+        bounds          (list)  (mandatory): A list of [longitude, latitude] pairs, in EPSG:4326, whose bounding box is tiled.
+        scale           (float) (mandatory): The pixel size in meters.
+        bytesPerPixel   (int)   (mandatory): The bytes of a pixel across all bands.
+        maxBytes        (int)   (optional):  The maximum uncompressed size of a tile. Defaults to DOWNLOAD_REQUEST_SIZE_LIMIT.
+        maxDimension    (int)   (optional):  The maximum width or height of a tile in pixels. Defaults to DOWNLOAD_GRID_DIMENSION_LIMIT.
+    Notes:
+        -A single tile is returned for bounds under the limits.
+    """
+    longitudes = [point[0] for point in bounds]
+    latitudes = [point[1] for point in bounds]
+    west, east, south, north = min(longitudes), max(longitudes), min(latitudes), max(latitudes)
+
+    # a square tile side in pixels, shrunk by a tenth to leave room for the pixels partially covered at the edges.
+    side = min(maxDimension, int(math.sqrt(maxBytes / bytesPerPixel))) * 0.9
+
+    # a degree of longitude is the longest at the latitude closest to the equator.
+    closestLatitude = 0 if south <= 0 <= north else min(abs(south), abs(north))
+    longitudeStep = side * scale / (METERS_PER_DEGREE * math.cos(math.radians(closestLatitude)))
+    latitudeStep = side * scale / METERS_PER_DEGREE
+
+    rows = max(1, math.ceil((north - south) / latitudeStep))
+    columns = max(1, math.ceil((east - west) / longitudeStep))
+    latitudeStep = (north - south) / rows
+    longitudeStep = (east - west) / columns
+
+    return [(row, column, [west + column * longitudeStep, north - (row + 1) * latitudeStep, west + (column + 1) * longitudeStep,
+                           north - row * latitudeStep])
+            for row in range(rows) for column in range(columns)]
+
+
+@initialization._ensure_initialized
+def _image_to_numpy_fetcher(image, region, scale: float, bandNames: list = None, bytesPerPixel: int = None, structured: bool = True,
+                            maxWorkers: int = 4, retries: int = 3):
+    """
+    Description:
+        Returns the pixels of an image over a region as a NumPy structured array keyed by band name, or a dictionary of arrays, without
+        writing any file.
+    Arguments:
+        image           (ee.Image)                  (mandatory): The image to fetch.
+        region          (ee.Geometry/dict/list)     (mandatory): The region, as an ee.Geometry, a GeoJSON dictionary or a list of
+                                                                 coordinates in EPSG:4326.
+        scale           (float)                     (mandatory): The pixel size in meters at the equator.
+        bandNames       (list)                      (optional):  The bands to fetch. Defaults to all the bands of the image.
+        bytesPerPixel   (int)                       (optional):  The bytes of a pixel across all bands. Defaults to 8 per band.
+        structured      (bool)                      (optional):  Whether to return a structured array, rather than a dictionary from band
+                                                                 name to array. Defaults to True.
+        maxWorkers      (int)                       (optional):  The maximum number of concurrent chunk fetches. Defaults to 4.
+        retries         (int)                       (optional):  The number of times a failed chunk is fetched again. Defaults to 3.
+    Notes:
+        -The pixels lie on an EPSG:4326 grid with origin at the north-west corner of the bounds of the region and a pixel size of
+        scale / METERS_PER_DEGREE degrees, i.e. the affine transform [size, 0, west, 0, -size, north].
+        -Regions over the request limits are fetched in square chunks of that grid, concurrently, and assembled exactly.
+        -Each chunk is requested in the NPY format and its body is streamed into a preallocated buffer, which is then copied into the
+        preallocated result. The dictionary of arrays holds views of the structured array, hence no further copy.
+        -The bounds and band count, when not known on the client, are retrieved in a single getInfo.
+        -Raises a SystemExit listing the chunks that still failed after their retries.
+    """
+    if bandNames is not None:
+        image = image.select(bandNames)
+
+    bounds = _region_bounds_creator(region)
+    bandCount = image.bandNames().size() if bytesPerPixel is None else bytesPerPixel
+
+    # retrieve whatever is not known on the client in a single round trip.
+    if any(isinstance(value, ee.ComputedObject) for value in [bounds, bandCount]):
+        bounds, bandCount = instrumentation._get_info(ee.List([bounds, bandCount]))
+    bytesPerPixel = 8 * bandCount if bytesPerPixel is None else bytesPerPixel
+
+    longitudes = [point[0] for point in bounds]
+    latitudes = [point[1] for point in bounds]
+    west, north = min(longitudes), max(latitudes)
+    pixelSize = scale / METERS_PER_DEGREE
+    width = max(1, math.ceil((max(longitudes) - west) / pixelSize))
+    height = max(1, math.ceil((north - min(latitudes)) / pixelSize))
+
+    # chunks as (first row, last row, first column, last column) ranges of the grid, square and under the request limits.
+    side = min(DOWNLOAD_GRID_DIMENSION_LIMIT, int(math.sqrt(DOWNLOAD_REQUEST_SIZE_LIMIT / bytesPerPixel)))
+    chunks = [(row, min(row + side, height), column, min(column + side, width)) for row in range(0, height, side)
+              for column in range(0, width, side)]
+
+    # numpy is only imported by the functions that return arrays, so that importing this module stays cheap.
+    import numpy as np
+
+    result = {"array": None}
+    resultLock = threading.Lock()
+
+    def _inner_function(chunk):
+        firstRow, lastRow, firstColumn, lastColumn = chunk
+        params = {"format": "NPY", "crs": "EPSG:4326", "dimensions": "{}x{}".format(lastColumn - firstColumn, lastRow - firstRow),
+                  "crs_transform": [pixelSize, 0, west + firstColumn * pixelSize, 0, -pixelSize, north - firstRow * pixelSize]}
+        for attempt in range(retries + 1):
+            try:
+                chunkArray = _numpy_download(instrumentation._get_download_url(image, params))
+                break
+            except (Exception, SystemExit) as error:
+                if attempt == retries:
+                    return "rows {}-{}, columns {}-{}: {}".format(firstRow, lastRow, firstColumn, lastColumn, error)
+                time.sleep(2 ** attempt)
+
+        if chunkArray.shape != (lastRow - firstRow, lastColumn - firstColumn):
+            return "rows {}-{}, columns {}-{}: unexpected shape {}".format(firstRow, lastRow, firstColumn, lastColumn, chunkArray.shape)
+
+        # the result is allocated once, with the dtype of the first chunk to arrive.
+        with resultLock:
+            if result["array"] is None:
+                result["array"] = np.empty((height, width), dtype=chunkArray.dtype)
+        result["array"][firstRow:lastRow, firstColumn:lastColumn] = chunkArray
+        return None
+
+    with concurrent.futures.ThreadPoolExecutor(max_workers=maxWorkers) as executor:
+        failedChunks = [error for error in executor.map(_inner_function, chunks) if error is not None]
+
+    if failedChunks:
+        raise SystemExit("{} of {} chunks failed: {}".format(len(failedChunks), len(chunks), "; ".join(failedChunks)))
+
+    if structured:
+        return result["array"]
+
+    return {bandName: result["array"][bandName] for bandName in result["array"].dtype.names}
+
+
+def _numpy_download(url: str):
+    """
+    Description:
+        Returns the array of an NPY response, streaming its body into a buffer allocated from the NPY header.
+    Arguments:
+        url (str)   (mandatory): Self-explanatory.
+    Notes:
+        None.
+    """
+    import numpy as np
+
+    response = _download_request(url)
+    try:
+        with instrumentation._server_call("download") as record:
+            stream = response.raw
+            stream.decode_content = True
+
+            version = np.lib.format.read_magic(stream)
+            if version == (1, 0):
+                shape, fortranOrder, dtype = np.lib.format.read_array_header_1_0(stream)
+            else:
+                shape, fortranOrder, dtype = np.lib.format.read_array_header_2_0(stream)
+
+            array = np.empty(shape, dtype=dtype, order="F" if fortranOrder else "C")
+            buffer = memoryview(array.reshape(-1, order="A").view(np.uint8))
+
+            position = 0
+            while position < len(buffer):
+                readBytes = stream.readinto(buffer[position:position + 1024 * 1024])
+                if not readBytes:
+                    raise SystemExit("Incomplete NPY response: expected {} bytes, got {}".format(len(buffer), position))
+                position += readBytes
+            record["bytes"] = position
+    except requests.exceptions.RequestException as error:
+        raise SystemExit(error)
+    finally:
+        response.close()
+
+    return array
 
-    # if fileSize >= float(3e+9):  # 3GB TOO_LONG
-    #     print("Please try again in few moments.")
-    #     response.close()
-    #     sys.exit()
 
-    blockSize = 1024  # 1 MB
+def _region_bounds_creator(region):
+    # the corners of the region on the client, or its bounds on the server if the region is an ee.Geometry.
+    if isinstance(region, ee.ComputedObject):
+        return ee.Geometry(region).bounds(1).coordinates().get(0)
+    coordinates = region["coordinates"] if isinstance(region, dict) else region
+    return _coordinates_flattener(coordinates)
 
-    fileProgressBar = tqdm.tqdm(total=fileSize, desc=image.get("description").getInfo(), unit='kB', position=1, unit_scale=True, leave=True)
 
-    # write the contents of the variable into a file.
-    with open('{}/{}.{}'.format(path, image.get("description").getInfo(), extension), 'wb') as file:
-        for block in response.iter_content(blockSize):
-            file.write(block)
-            fileProgressBar.update(len(block))
-        # file.write(response.content)
-        file.close()
-    response.close()
-    fileProgressBar.close()
+def _coordinates_flattener(coordinates):
+    # the [longitude, latitude] pairs of arbitrarily nested GeoJSON coordinates.
+    if isinstance(coordinates[0], (int, float)):
+        return [coordinates]
+    return [point for item in coordinates for point in _coordinates_flattener(item)]
 
 
-def _image_to_asset_exporter(image, bandType: str, kwargs: dict):
+@initialization._ensure_initialized
+def _image_to_asset_exporter(image, bandType: str, kwargs: dict, description: str = None, bandNames: list = None, start: bool = True):
     """
     Description:
         Creates a batch task to export an Image as a raster to an Earth Engine asset.
@@ -87,6 +564,9 @@ def _image_to_asset_exporter(image, bandType: str, kwargs: dict):
         bandType    (str)       (mandatory): A dictionary from band name to band types.
         bandOrder   (list)      (optional):  A list specifying the order of the bands in the result.
         kwargs      (dict)      (optional):  Dictionary of optional parameters.
+        description (str)       (optional):  The already retrieved "description" property of the image. Defaults to None.
+        bandNames   (list)      (optional):  The already retrieved band names of the image. Defaults to None.
+        start       (bool)      (optional):  Whether to start the export task. Defaults to True.
     Notes:
         -The argument bandType must be one of: 'int8', 'int16', 'int32', 'int64', 'uint8', 'uint16',
         'uint32', 'byte', 'short', 'int', 'long', 'float' and 'double'.
@@ -95,24 +575,29 @@ def _image_to_asset_exporter(image, bandType: str, kwargs: dict):
         -If the argument bandOrder isn't also specified, new bands will be appended in alphabetical order.
         -All images to be exported must contain a field named "description".
         -The function does not check for the validity of the provided options so caution needs to be exercised.
+        -If the arguments description and bandNames are not specified they are retrieved from the server.
+        -Returns the id of the started export task, or the export task itself if the argument start is False.
     """
-    if not bool(kwargs) or image.get("description").getInfo() is None:
-        raise ValueError("Either an image does not have a description property or no parameters were specified for the image export task")
+    if description is None:
+        description = instrumentation._get_info(image.get("description"))
 
-    # Error: Exported bands must have compatible data types. found inconsistent types.
-    bandTypes = ee.List.repeat(bandType, image.bandNames().size())
-    bandDictionary = ee.Dictionary.fromLists(image.bandNames(), bandTypes)
+    if not bool(kwargs) or description is None:
+        raise ValueError("Either an image does not have a description property or no parameters were specified for the image export task")
 
-    image = image.cast(bandDictionary)
+    image = image.cast(_band_type_dictionary_creator(image, bandType, bandNames))
 
     # export task creation.
-    task = ee.batch.Export.image.toAsset(image=image, description=image.get("description").getInfo(), **kwargs)
+    task = ee.batch.Export.image.toAsset(image=image, description=description, **kwargs)
+    if not start:
+        return task
+
     # Start the export task.
-    task.start()
+    instrumentation._start_task(task)
     return task.id
 
 
-def _image_to_drive_exporter(image, bandType: str, kwargs: dict):
+@initialization._ensure_initialized
+def _image_to_drive_exporter(image, bandType: str, kwargs: dict, description: str = None, bandNames: list = None, start: bool = True):
     """
     Description:
         Creates a batch task to export an Image as a raster to Google Drive.
@@ -121,6 +606,9 @@ def _image_to_drive_exporter(image, bandType: str, kwargs: dict):
         bandType    (str)       (mandatory): A dictionary from band name to band types.
         bandOrder   (list)      (optional):  A list specifying the order of the bands in the result.
         kwargs      (dict)      (optional):  Dictionary of optional parameters.
+        description (str)       (optional):  The already retrieved "description" property of the image. Defaults to None.
+        bandNames   (list)      (optional):  The already retrieved band names of the image. Defaults to None.
+        start       (bool)      (optional):  Whether to start the export task. Defaults to True.
     Notes:
         -The argument bandType must be one of: 'int8', 'int16', 'int32', 'int64', 'uint8', 'uint16',
         'uint32', 'byte', 'short', 'int', 'long', 'float' and 'double'.
@@ -129,24 +617,29 @@ def _image_to_drive_exporter(image, bandType: str, kwargs: dict):
         -If the argument bandOrder isn't also specified, new bands will be appended in alphabetical order.
         -All images to be exported must contain a field named "description".
         -The function does not check for the validity of the provided options so caution needs to be exercised.
+        -If the arguments description and bandNames are not specified they are retrieved from the server.
+        -Returns the id of the started export task, or the export task itself if the argument start is False.
     """
-    if not bool(kwargs) or image.get("description").getInfo() is None:
-        raise ValueError("Either an image does not have a description property or no parameters were specified for the image export task")
+    if description is None:
+        description = instrumentation._get_info(image.get("description"))
 
-    # Error: Exported bands must have compatible data types. found inconsistent types.
-    bandTypes = ee.List.repeat(bandType, image.bandNames().size())
-    bandDictionary = ee.Dictionary.fromLists(image.bandNames(), bandTypes)
+    if not bool(kwargs) or description is None:
+        raise ValueError("Either an image does not have a description property or no parameters were specified for the image export task")
 
-    image = image.cast(bandDictionary)
+    image = image.cast(_band_type_dictionary_creator(image, bandType, bandNames))
 
     # export task creation.
-    task = ee.batch.Export.image.toDrive(image=image, description=image.get("description").getInfo(), **kwargs)
+    task = ee.batch.Export.image.toDrive(image=image, description=description, **kwargs)
+    if not start:
+        return task
+
     # Start the export task.
-    task.start()
+    instrumentation._start_task(task)
     return task.id
 
 
-def _image_to_cloud_storage_exporter(image, bandType: str, kwargs: dict):
+@initialization._ensure_initialized
+def _image_to_cloud_storage_exporter(image, bandType: str, kwargs: dict, description: str = None, bandNames: list = None, start: bool = True):
     """
     Description:
         Creates a batch task to export an Image as a raster to Google Drive.
@@ -155,6 +648,9 @@ def _image_to_cloud_storage_exporter(image, bandType: str, kwargs: dict):
         bandType    (str)       (mandatory): A dictionary from band name to band types.
         bandOrder   (list)      (optional):  A list specifying the order of the bands in the result.
         kwargs      (dict)      (optional):  Dictionary of optional parameters.
+        description (str)       (optional):  The already retrieved "description" property of the image. Defaults to None.
+        bandNames   (list)      (optional):  The already retrieved band names of the image. Defaults to None.
+        start       (bool)      (optional):  Whether to start the export task. Defaults to True.
     Notes:
         -The argument bandType must be one of: 'int8', 'int16', 'int32', 'int64', 'uint8', 'uint16',
         'uint32', 'byte', 'short', 'int', 'long', 'float' and 'double'.
@@ -163,18 +659,42 @@ def _image_to_cloud_storage_exporter(image, bandType: str, kwargs: dict):
         -If the argument bandOrder isn't also specified, new bands will be appended in alphabetical order.
         -All images to be exported must contain a field named "description".
         -The function does not check for the validity of the provided options so caution needs to be exercised.
+        -If the arguments description and bandNames are not specified they are retrieved from the server.
+        -Returns the id of the started export task, or the export task itself if the argument start is False.
     """
-    if not bool(kwargs) or image.get("description").getInfo() is None:
-        raise ValueError("Either an image does not have a description property or no parameters were specified for the image export task")
+    if description is None:
+        description = instrumentation._get_info(image.get("description"))
 
-    # Error: Exported bands must have compatible data types. found inconsistent types.
-    bandTypes = ee.List.repeat(bandType, image.bandNames().size())
-    bandDictionary = ee.Dictionary.fromLists(image.bandNames(), bandTypes)
+    if not bool(kwargs) or description is None:
+        raise ValueError("Either an image does not have a description property or no parameters were specified for the image export task")
 
-    image = image.cast(bandDictionary)
+    image = image.cast(_band_type_dictionary_creator(image, bandType, bandNames))
 
     # export task creation.
-    task = ee.batch.Export.image.toCloudStorage(image=image, description=image.get("description").getInfo(), **kwargs)
+    task = ee.batch.Export.image.toCloudStorage(image=image, description=description, **kwargs)
+    if not start:
+        return task
+
     # Start the export task.
-    task.start()
+    instrumentation._start_task(task)
     return task.id
+
+
+@initialization._ensure_initialized
+def _band_type_dictionary_creator(image, bandType: str, bandNames: list = None):
+    """
+    Description:
+        Returns a dictionary from band name to band type, assigning the same band type to every band of the image.
+    Arguments:
+        image       (ee.Image)  (mandatory): Self-explanatory.
+        bandType    (str)       (mandatory): The band type.
+        bandNames   (list)      (optional):  The already retrieved band names of the image. Defaults to None.
+    Notes:
+        -If the argument bandNames is specified the dictionary is built on the client, otherwise on the server.
+    """
+    # Error: Exported bands must have compatible data types. found inconsistent types.
+    if bandNames is not None:
+        return {bandName: bandType for bandName in bandNames}
+
+    bandTypes = ee.List.repeat(bandType, image.bandNames().size())
+    return ee.Dictionary.fromLists(image.bandNames(), bandTypes)
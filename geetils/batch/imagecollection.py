@@ -1,21 +1,69 @@
 import ee
+import time
+import tqdm
+import concurrent.futures
 from . import image
+from . import scheduler
+from .. import initialization
+from .. import instrumentation
 
 """
 Utilizing the static methods of Google Earth Engine's Python API this module includes functions to handle the process of exporting image collections.
 """
 
 
-def _collection_to_local_hard_drive_exporter(collection, path: str = None, extension: str = 'zip', bandType: str = None, bandOrder: list = None, **kwargs: dict):
+@initialization._ensure_initialized
+def _collection_metadata_extractor(collection):
     """
     Description:
-        Exports an image collection's images as Earth Engine assets.
+        Returns a list of dictionaries, one per image in collection order, with the keys "description", "index" and "bandNames".
+    Arguments:
+        collection  (ee.ImageCollection)    (mandatory): The collection of images.
+    Notes:
+        -The metadata of all images is retrieved in a single server round trip.
+        -Images without a "description" property get a None description.
+    """
+    def _inner_function(image):
+        image = ee.Image(image)
+        # the property is always set, so aggregate_array keeps the metadata of every image aligned with the collection order.
+        return image.set("geetils_metadata", ee.List([image.get("description"), image.get("system:index"), image.bandNames()]))
+
+    metadataList = instrumentation._get_info(collection.map(_inner_function).aggregate_array("geetils_metadata"))
+
+    return [{"description": description, "index": index, "bandNames": bandNames} for description, index, bandNames in metadataList]
+
+
+@initialization._ensure_initialized
+def _image_selector(collection, index: str):
+    """
+    Description:
+        Returns the image of the collection with the provided system:index.
+    Arguments:
+        collection  (ee.ImageCollection)    (mandatory): The collection of images.
+        index       (str)                   (mandatory): The system:index of the image.
+    Notes:
+        -Unlike collection.toList(collection.size()).get(counter), the expression does not materialize the whole collection as a list.
+    """
+    return ee.Image(collection.filter(ee.Filter.eq("system:index", index)).first())
+
+
+@initialization._ensure_initialized
+def _collection_to_local_hard_drive_exporter(collection, path: str = None, extension: str = 'zip', bandType: str = None, bandOrder: list = None,
+                                             maxWorkers: int = 4, resume: bool = False, ingest: bool = False, tiled: bool = None, **kwargs: dict):
+    """
+    Description:
+        Downloads an image collection's images to the local hard drive, running up to maxWorkers downloads concurrently.
     Arguments:
         collection  (ee.ImageCollection)    (mandatory): The collection of images.
         path        (str)                   (mandatory): The path to download the image. Defaults to None.
         extension   (str)                   (mandatory): Self-explanatory. Defaults to zip.
         bandType    (str)                   (mandatory): A dictionary from band name to band types.
         bandOrder   (list)                  (optional):  A list specifying the order of the bands in the result.
+        maxWorkers  (int)                   (optional):  The maximum number of concurrent downloads. Defaults to 4.
+        resume      (bool)                  (optional):  Whether to resume interrupted downloads and skip completed ones. Defaults to False.
+        ingest      (bool)                  (optional):  Whether to write each zip into a memory-mapped array. Defaults to False.
+        tiled       (bool)                  (optional):  Whether to download each image in tiles. Defaults to None, which falls back to
+                                                         tiles only for the images whose request is over its limits.
         kwargs      (dictionary)            (optional):  Dictionary of optional parameters.
     Notes:
         -The argument bandType must be one of: 'int8', 'int16', 'int32', 'int64', 'uint8', 'uint16',
@@ -26,23 +74,46 @@ def _collection_to_local_hard_drive_exporter(collection, path: str = None, exten
         -All images to be exported must contain a field named "description".
         -The function does not check for the validity of the provided options so caution needs to be exercised.
         -The following is an example value for the extension argument(e.g. type 'zip' and not '.zip').
+        -Each image is addressed by its system:index, so the size of each request does not depend on the size of the collection.
+        -The metadata of all images is retrieved in a single server round trip before any download starts.
+        -All downloads report to a single progress bar, which depicts the aggregate transfer rate.
+        -If the argument resume is True, re-running a failed export only transfers the missing bytes (see _image_to_local_hard_drive_exporter).
+        -Images downloaded in tiles are mosaicked into "<description>.tif" and their dictionary also holds the key "tiles" (see
+        _image_to_local_hard_drive_exporter).
+        -Returns a list with one dictionary per image, in collection order, with the keys "path", "bytes", "duration", "skipped" and "error".
+        A failed download does not interrupt the rest; its "error" holds the cause of the failure and is None otherwise.
     """
-    exportTasksIdsList = []
-    listOfImages = collection.toList(collection.size())
-    size = listOfImages.size().getInfo()
-
-    # client side loop.
-    for counter in range(size):
-        # typecasting is necessary
-        imageToExport = ee.Image(listOfImages.get(counter))
-
-        taskID = image._export_image_to_local_hard_drive(imageToExport, kwargs, path, extension)
-
-        exportTasksIdsList.append(taskID)
-    return exportTasksIdsList
-
-
-def _collection_to_asset_exporter(collection, bandType: str, kwargs: dict):
+    metadataList = _collection_metadata_extractor(collection)
+    size = len(metadataList)
+
+    progressBar = tqdm.tqdm(total=0, desc="Downloading {} images".format(size), unit='B', unit_scale=True, unit_divisor=1024, leave=True)
+    failedDownloads = []
+
+    def _inner_function(metadata):
+        startTime = time.time()
+        imageToExport = _image_selector(collection, metadata["index"])
+        try:
+            result = image._image_to_local_hard_drive_exporter(imageToExport, kwargs, path, extension, progressBar, resume,
+                                                            metadata["description"], ingest, tiled)
+            result["error"] = None
+        except (Exception, SystemExit) as error:
+            # the image exporter exits on request errors, which must not bring down the remaining downloads.
+            result = {"path": None, "bytes": 0, "duration": time.time() - startTime, "skipped": False, "error": str(error)}
+            with progressBar.get_lock():
+                failedDownloads.append(metadata["index"])
+                progressBar.set_postfix(failed=len(failedDownloads))
+        return result
+
+    # the downloads are bound by the network and not by the interpreter, thus threads suffice.
+    with concurrent.futures.ThreadPoolExecutor(max_workers=maxWorkers) as executor:
+        downloadReport = list(executor.map(_inner_function, metadataList))
+
+    progressBar.close()
+    return downloadReport
+
+
+@initialization._ensure_initialized
+def _collection_to_asset_exporter(collection, bandType: str, kwargs: dict, maxConcurrentTasks: int = None):
     """
     Description:
         Exports an image collection's images as Earth Engine assets.
@@ -51,6 +122,7 @@ def _collection_to_asset_exporter(collection, bandType: str, kwargs: dict):
         bandType    (str)                   (mandatory): A dictionary from band name to band types.
         bandOrder   (list)                  (optional):  A list specifying the order of the bands in the result.
         kwargs      (dict)                  (optional):  Dictionary of optional parameters.
+        maxConcurrentTasks (int)            (optional):  The maximum number of export tasks active at once. Defaults to None.
     Notes:
         -The argument bandType must be one of: 'int8', 'int16', 'int32', 'int64', 'uint8', 'uint16',
         'uint32', 'byte', 'short', 'int', 'long', 'float' and 'double'.
@@ -59,23 +131,31 @@ def _collection_to_asset_exporter(collection, bandType: str, kwargs: dict):
         -If the argument bandOrder isn't also specified, new bands will be appended in alphabetical order.
         -All images to be exported must contain a field named "description".
         -The function does not check for the validity of the provided options so caution needs to be exercised.
+        -Each image is addressed by its system:index, so the size of each request does not depend on the size of the collection.
+        -The metadata of all images is retrieved in a single server round trip before any export task is created.
+        -If the argument maxConcurrentTasks is not specified every export task is started at once and their ids are returned. Otherwise an
+        _ExportTaskScheduler is returned, which keeps at most maxConcurrentTasks export tasks queued or running on the server.
     """
-    exportTasksIdsList = []
-    listOfImages = collection.toList(collection.size())
-    size = listOfImages.size().getInfo()
+    exportTasksList = []
+    metadataList = _collection_metadata_extractor(collection)
 
     # client side loop.
-    for counter in range(size):
-        # typecasting is necessary
-        imageToExport = ee.Image(listOfImages.get(counter))
+    for metadata in metadataList:
+        imageToExport = _image_selector(collection, metadata["index"])
 
-        taskID = image._image_to_asset_exporter(imageToExport, bandType, kwargs)
+        exportTask = image._image_to_asset_exporter(imageToExport, bandType, kwargs, metadata["description"], metadata["bandNames"],
+                                                    maxConcurrentTasks is None)
 
-        exportTasksIdsList.append(taskID)
-    return exportTasksIdsList
+        exportTasksList.append(exportTask)
 
+    if maxConcurrentTasks is not None:
+        # the export tasks have not been started, the scheduler starts them as slots free up.
+        return scheduler._ExportTaskScheduler(exportTasksList, maxConcurrentTasks)
+    return exportTasksList
 
-def _collection_to_drive_exporter(collection, bandType: str, kwargs: dict):
+
+@initialization._ensure_initialized
+def _collection_to_drive_exporter(collection, bandType: str, kwargs: dict, maxConcurrentTasks: int = None):
     """
     Description:
         Creates a batch task to export an Image as a raster to Google Drive.
@@ -84,6 +164,7 @@ def _collection_to_drive_exporter(collection, bandType: str, kwargs: dict):
         bandType    (str)                   (mandatory): A dictionary from band name to band types.
         bandOrder   (list)                  (optional):  A list specifying the order of the bands in the result.
         kwargs      (dict)                  (optional):  Dictionary of optional parameters.
+        maxConcurrentTasks (int)            (optional):  The maximum number of export tasks active at once. Defaults to None.
     Notes:
         -The argument bandType must be one of: 'int8', 'int16', 'int32', 'int64', 'uint8', 'uint16',
         'uint32', 'byte', 'short', 'int', 'long', 'float' and 'double'.
@@ -92,23 +173,31 @@ def _collection_to_drive_exporter(collection, bandType: str, kwargs: dict):
         -If the argument bandOrder isn't also specified, new bands will be appended in alphabetical order.
         -All images to be exported must contain a field named "description".
         -The function does not check for the validity of the provided options so caution needs to be exercised.
+        -Each image is addressed by its system:index, so the size of each request does not depend on the size of the collection.
+        -The metadata of all images is retrieved in a single server round trip before any export task is created.
+        -If the argument maxConcurrentTasks is not specified every export task is started at once and their ids are returned. Otherwise an
+        _ExportTaskScheduler is returned, which keeps at most maxConcurrentTasks export tasks queued or running on the server.
     """
-    exportTasksIdsList = []
-    listOfImages = collection.toList(collection.size())
-    size = listOfImages.size().getInfo()
+    exportTasksList = []
+    metadataList = _collection_metadata_extractor(collection)
 
     # client side loop.
-    for counter in range(size):
-        # typecasting is necessary
-        imageToExport = ee.Image(listOfImages.get(counter))
+    for metadata in metadataList:
+        imageToExport = _image_selector(collection, metadata["index"])
+
+        exportTask = image._image_to_drive_exporter(imageToExport, bandType, kwargs, metadata["description"], metadata["bandNames"],
+                                                    maxConcurrentTasks is None)
 
-        taskID = image._image_to_drive_exporter(imageToExport, bandType, kwargs)
+        exportTasksList.append(exportTask)
 
-        exportTasksIdsList.append(taskID)
-    return exportTasksIdsList
+    if maxConcurrentTasks is not None:
+        # the export tasks have not been started, the scheduler starts them as slots free up.
+        return scheduler._ExportTaskScheduler(exportTasksList, maxConcurrentTasks)
+    return exportTasksList
 
 
-def _collection_to_cloud_storage_exporter(collection, bandType: str, kwargs: dict):
+@initialization._ensure_initialized
+def _collection_to_cloud_storage_exporter(collection, bandType: str, kwargs: dict, maxConcurrentTasks: int = None):
     """
     Description:
         Exports an image collection's images to Google Cloud Storage.
@@ -117,6 +206,7 @@ def _collection_to_cloud_storage_exporter(collection, bandType: str, kwargs: dic
         bandType    (str)                   (mandatory): A dictionary from band name to band types.
         bandOrder   (list)                  (optional):  A list specifying the order of the bands in the result.
         kwargs      (dict)                  (optional):  Dictionary of optional parameters.
+        maxConcurrentTasks (int)            (optional):  The maximum number of export tasks active at once. Defaults to None.
     Notes:
         -The argument bandType must be one of: 'int8', 'int16', 'int32', 'int64', 'uint8', 'uint16',
         'uint32', 'byte', 'short', 'int', 'long', 'float' and 'double'.
@@ -125,20 +215,27 @@ def _collection_to_cloud_storage_exporter(collection, bandType: str, kwargs: dic
         -If the argument bandOrder isn't also specified, new bands will be appended in alphabetical order.
         -All images to be exported must contain a field named "description".
         -The function does not check for the validity of the provided options so caution needs to be exercised.
+        -Each image is addressed by its system:index, so the size of each request does not depend on the size of the collection.
+        -The metadata of all images is retrieved in a single server round trip before any export task is created.
+        -If the argument maxConcurrentTasks is not specified every export task is started at once and their ids are returned. Otherwise an
+        _ExportTaskScheduler is returned, which keeps at most maxConcurrentTasks export tasks queued or running on the server.
     """
-    exportTasksIdsList = []
-    listOfImages = collection.toList(collection.size())
-    size = listOfImages.size().getInfo()
+    exportTasksList = []
+    metadataList = _collection_metadata_extractor(collection)
 
     # client side loop.
-    for counter in range(size):
-        # typecasting is necessary
-        imageToExport = ee.Image(listOfImages.get(counter))
+    for metadata in metadataList:
+        imageToExport = _image_selector(collection, metadata["index"])
+
+        exportTask = image._image_to_cloud_storage_exporter(imageToExport, bandType, kwargs, metadata["description"], metadata["bandNames"],
+                                                            maxConcurrentTasks is None)
 
-        taskID = image._image_to_cloud_storage_exporter(imageToExport, bandType, kwargs)
+        exportTasksList.append(exportTask)
 
-        exportTasksIdsList.append(taskID)
-    return exportTasksIdsList
+    if maxConcurrentTasks is not None:
+        # the export tasks have not been started, the scheduler starts them as slots free up.
+        return scheduler._ExportTaskScheduler(exportTasksList, maxConcurrentTasks)
+    return exportTasksList
 
 # https://gis.stackexchange.com/questions/307974/what-are-the-other-bits-in-sentinels-qa60-band
 # https://forum.step.esa.int/t/sentinel-2-msi-level-1c-qa60-band/24884
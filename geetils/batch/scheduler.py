@@ -0,0 +1,225 @@
+import ee
+import threading
+import collections
+from .. import common
+from .. import instrumentation
+
+"""
+Utilizing the static methods of Google Earth Engine's Python API this module includes functions to handle the process of scheduling export tasks.
+"""
+
+
+class _ExportTaskScheduler:
+    """
+    Description:
+        Starts export tasks from a local queue, keeping at most maxConcurrentTasks of them queued or running on the server.
+    Arguments:
+        exportTasksList     (list)  (mandatory): The list of export tasks which have not been started.
+        maxConcurrentTasks  (int)   (optional):  The maximum number of export tasks active at once. Defaults to 10.
+        pollingInterval     (float) (optional):  The seconds between two checks of the active export tasks. Defaults to 30.
+        maxStartAttempts    (int)   (optional):  The number of times the start of an export task is attempted. Defaults to 5.
+    Notes:
+        -The export tasks are started by a background thread, in the order they are provided. A new export task is started as soon as an
+        active export task reaches one of the states in common.TERMINAL_TASK_STATES.
+        -An export task whose start fails (e.g. because of the concurrent tasks limit or a network error) stays at the front of the queue
+        and is retried on the next check, and so is a check of the active export tasks that fails. After maxStartAttempts failed starts
+        (e.g. an invalid asset id) the export task is dropped, counted as "FAILED_TO_START" by progress() and reported by start_errors(),
+        so that it does not hold back the export tasks after it.
+        -The background thread does not keep the interpreter alive, call wait() in scripts that have nothing left to do.
+    """
+
+    def __init__(self, exportTasksList: list, maxConcurrentTasks: int = 10, pollingInterval: float = 30, maxStartAttempts: int = 5):
+        if maxConcurrentTasks < 1:
+            raise ValueError("Parameter maxConcurrentTasks must be a positive integer")
+        if maxStartAttempts < 1:
+            raise ValueError("Parameter maxStartAttempts must be a positive integer")
+
+        self.maxConcurrentTasks = maxConcurrentTasks
+        self.pollingInterval = pollingInterval
+        self.maxStartAttempts = maxStartAttempts
+
+        self.pendingTasks = collections.deque(exportTasksList)
+        self.activeTasks = {}  # export task id to export task.
+        self.finishedTasks = {}  # export task id to export task state.
+        self.submittedTasksIdsList = []
+        self.failedStartsList = []  # (export task, error message) of the export tasks dropped after maxStartAttempts.
+        self._startAttempts = 0  # failed starts of the export task at the front of the queue.
+
+        self._lock = threading.Lock()
+        self._cancelled = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def _run(self):
+        while True:
+            self._submit()
+
+            with self._lock:
+                if not self.pendingTasks and not self.activeTasks:
+                    break
+
+            # the event is set on cancellation, which cuts the wait short.
+            if self._cancelled.wait(self.pollingInterval):
+                break
+            self._poll()
+
+    def _submit(self):
+        while not self._cancelled.is_set():
+            with self._lock:
+                if not self.pendingTasks or len(self.activeTasks) >= self.maxConcurrentTasks:
+                    return
+                # the export task stays at the front of the queue until it is started, the lock is not held during the request.
+                exportTask = self.pendingTasks[0]
+
+            try:
+                instrumentation._start_task(exportTask)
+            except Exception as error:
+                with self._lock:
+                    self._startAttempts += 1
+                    if self._startAttempts < self.maxStartAttempts:
+                        # back off until the next check.
+                        return
+                    if self.pendingTasks and self.pendingTasks[0] is exportTask:
+                        self.pendingTasks.popleft()
+                    self.failedStartsList.append((exportTask, str(error)))
+                    self._startAttempts = 0
+                continue
+
+            with self._lock:
+                self._startAttempts = 0
+                # cancel() may have cleared the queue meanwhile, it then cancels the export task once this thread has stopped.
+                if self.pendingTasks and self.pendingTasks[0] is exportTask:
+                    self.pendingTasks.popleft()
+                self.activeTasks[exportTask.id] = exportTask
+                self.submittedTasksIdsList.append(exportTask.id)
+
+    def _poll(self):
+        with self._lock:
+            activeTasksIdsList = list(self.activeTasks)
+
+        if not activeTasksIdsList:
+            return
+
+        try:
+            statusDictionary = common._export_tasks_status_retriever(activeTasksIdsList)
+        except Exception:
+            # the export tasks are checked again on the next poll.
+            return
+
+        with self._lock:
+            for exportTaskId in activeTasksIdsList:
+                taskState = statusDictionary.get(exportTaskId, {}).get("state")
+                if taskState in common.TERMINAL_TASK_STATES and self.activeTasks.pop(exportTaskId, None) is not None:
+                    self.finishedTasks[exportTaskId] = taskState
+
+    def task_ids(self):
+        """
+        Description:
+            Returns the ids of the export tasks started so far, in the order they were started.
+        Arguments:
+            None.
+        Notes:
+            -The ids can be passed to common._export_tasks_viewer.
+        """
+        with self._lock:
+            return list(self.submittedTasksIdsList)
+
+    def progress(self):
+        """
+        Description:
+            Returns a dictionary with the number of export tasks per scheduling state.
+        Arguments:
+            None.
+        Notes:
+            -The keys are "PENDING" and "ACTIVE", for the export tasks which are waiting locally or on the server respectively, plus each
+            terminal state reached by at least one export task and "FAILED_TO_START" if any export task could not be started.
+        """
+        with self._lock:
+            progressDictionary = {"PENDING": len(self.pendingTasks), "ACTIVE": len(self.activeTasks)}
+            for taskState in self.finishedTasks.values():
+                progressDictionary[taskState] = progressDictionary.get(taskState, 0) + 1
+            if self.failedStartsList:
+                progressDictionary["FAILED_TO_START"] = len(self.failedStartsList)
+        return progressDictionary
+
+    def start_errors(self):
+        """
+        Description:
+            Returns a list of (export task, error message) pairs of the export tasks dropped after maxStartAttempts failed starts.
+        Arguments:
+            None.
+        Notes:
+            -The error message is that of the last attempt.
+        """
+        with self._lock:
+            return list(self.failedStartsList)
+
+    def done(self):
+        """
+        Description:
+            Returns whether every export task has been started and has terminated.
+        Arguments:
+            None.
+        Notes:
+            None.
+        """
+        with self._lock:
+            return not self.pendingTasks and not self.activeTasks
+
+    def wait(self, timeout: float = None):
+        """
+        Description:
+            Blocks until every export task has terminated or the timeout has passed, and returns the result of done().
+        Arguments:
+            timeout (float) (optional): The maximum seconds to wait. Defaults to None, which means no limit.
+        Notes:
+            None.
+        """
+        self._thread.join(timeout)
+        return self.done()
+
+    def cancel(self):
+        """
+        Description:
+            Drops the export tasks that have not been started and cancels the active ones.
+        Arguments:
+            None.
+        Notes:
+            -Returns once the scheduler has stopped.
+            -An active export task whose cancellation is rejected (e.g. because it terminated meanwhile) is recorded with the state the server
+            reports for it, or "UNKNOWN" if that is not a terminal state.
+        """
+        self._cancelled.set()
+
+        with self._lock:
+            self.pendingTasks.clear()
+
+        # once the background thread has stopped no export task is started or polled, so the active ones are final.
+        self._thread.join()
+
+        with self._lock:
+            activeTasksList = list(self.activeTasks.values())
+
+        rejectedTasksIdsList = []
+        for exportTask in activeTasksList:
+            try:
+                instrumentation._cancel_task(exportTask)
+            except ee.EEException:
+                rejectedTasksIdsList.append(exportTask.id)
+
+        statusDictionary = {}
+        if rejectedTasksIdsList:
+            try:
+                statusDictionary = common._export_tasks_status_retriever(rejectedTasksIdsList)
+            except ee.EEException:
+                pass
+
+        with self._lock:
+            for exportTask in activeTasksList:
+                if self.activeTasks.pop(exportTask.id, None) is None:
+                    continue
+                if exportTask.id not in rejectedTasksIdsList:
+                    self.finishedTasks[exportTask.id] = "CANCELLED"
+                else:
+                    taskState = statusDictionary.get(exportTask.id, {}).get("state")
+                    self.finishedTasks[exportTask.id] = taskState if taskState in common.TERMINAL_TASK_STATES else "UNKNOWN"
@@ -0,0 +1,174 @@
+import os
+import json
+import time
+import sqlite3
+import hashlib
+import threading
+import contextlib
+
+"""
+Utilizing the Python standard library this module includes functions to handle the process of memoizing the results of server
+expressions on disk.
+"""
+
+CACHE_LOCK = threading.Lock()
+
+CACHE_STATE = {
+    "enabled": False,
+    "bypass": False,
+    "path": os.path.join(os.path.expanduser("~"), ".cache", "geetils", "getinfo.sqlite"),
+    "ttl": 24 * 60 * 60,  # seconds.
+    "maxSize": 256 * 1024 * 1024  # bytes.
+}
+
+
+def _enable(path: str = None, ttl: float = None, maxSize: int = None):
+    """
+    Description:
+        Starts memoizing the results of every getInfo call of geetils in an SQLite database.
+    Arguments:
+        path    (str)   (optional): The path of the database file. Defaults to ~/.cache/geetils/getinfo.sqlite.
+        ttl     (float) (optional): The seconds after which a result expires. Defaults to one day.
+        maxSize (int)   (optional): The maximum total size, in bytes, of the stored results. Defaults to 256 MB.
+    Notes:
+        -Results are keyed on a hash of the serialized expression, so any change to the expression (e.g. a different filter) is a miss.
+        -When the stored results exceed maxSize, the least recently used ones are evicted.
+        -The results of expressions that depend on time (e.g. ee.Date of "now") or on mutable assets are stale until they expire.
+    """
+    if path is not None:
+        CACHE_STATE["path"] = path
+    if ttl is not None:
+        CACHE_STATE["ttl"] = ttl
+    if maxSize is not None:
+        CACHE_STATE["maxSize"] = maxSize
+
+    directory = os.path.dirname(os.path.abspath(CACHE_STATE["path"]))
+    os.makedirs(directory, exist_ok=True)
+
+    with _connection() as connection:
+        connection.execute("CREATE TABLE IF NOT EXISTS results (key TEXT PRIMARY KEY, value TEXT NOT NULL, created REAL NOT NULL, "
+                           "accessed REAL NOT NULL, size INTEGER NOT NULL)")
+        connection.execute("CREATE INDEX IF NOT EXISTS results_accessed ON results (accessed)")
+
+    CACHE_STATE["enabled"] = True
+
+
+def _disable():
+    """
+    Description:
+        Stops memoizing the results of getInfo calls, keeping the database file.
+    Arguments:
+        None.
+    Notes:
+        None.
+    """
+    CACHE_STATE["enabled"] = False
+
+
+@contextlib.contextmanager
+def _bypassing():
+    """
+    Description:
+        Performs the getInfo calls within the with block on the server, storing their fresh results.
+    Arguments:
+        None.
+    Notes:
+        -Setting CACHE_STATE["bypass"] to True has the same effect until it is set back to False.
+    """
+    wasBypassed = CACHE_STATE["bypass"]
+    CACHE_STATE["bypass"] = True
+    try:
+        yield
+    finally:
+        CACHE_STATE["bypass"] = wasBypassed
+
+
+def _clear():
+    """
+    Description:
+        Deletes every stored result.
+    Arguments:
+        None.
+    Notes:
+        None.
+    """
+    with _connection() as connection:
+        connection.execute("DELETE FROM results")
+
+
+def _expression_key(computedObject):
+    """
+    Description:
+        Returns the key of an expression: the SHA-256 hash of its serialization.
+    Arguments:
+        computedObject  (ee.ComputedObject) (mandatory): Self-explanatory.
+    Notes:
+        None.
+    """
+    return hashlib.sha256(computedObject.serialize().encode("utf-8")).hexdigest()
+
+
+def _lookup(key: str):
+    """
+    Description:
+        Returns a tuple of whether a fresh result is stored under the key and that result.
+    Arguments:
+        key (str)   (mandatory): A key as returned by _expression_key.
+    Notes:
+        -Always returns (False, None) within a _bypassing block.
+    """
+    if CACHE_STATE["bypass"]:
+        return False, None
+
+    now = time.time()
+    with _connection() as connection:
+        row = connection.execute("SELECT value, created FROM results WHERE key = ?", (key,)).fetchone()
+        if row is None or row[1] + CACHE_STATE["ttl"] <= now:
+            return False, None
+        connection.execute("UPDATE results SET accessed = ? WHERE key = ?", (now, key))
+    return True, json.loads(row[0])
+
+
+def _store(key: str, result):
+    """
+    Description:
+        Stores a result under the key, evicting expired and, if the cache is over its size, least recently used results.
+    Arguments:
+        key     (str)   (mandatory): A key as returned by _expression_key.
+        result  (any)   (mandatory): A JSON serializable result of getInfo.
+    Notes:
+        None.
+    """
+    now = time.time()
+    value = json.dumps(result)
+    with _connection() as connection:
+        connection.execute("INSERT OR REPLACE INTO results (key, value, created, accessed, size) VALUES (?, ?, ?, ?, ?)",
+                           (key, value, now, now, len(value)))
+        _evict(connection, now)
+
+
+def _evict(connection, now: float):
+    # expired results go first, then the least recently used ones until the total size fits.
+    connection.execute("DELETE FROM results WHERE created + ? <= ?", (CACHE_STATE["ttl"], now))
+
+    totalSize = connection.execute("SELECT COALESCE(SUM(size), 0) FROM results").fetchone()[0]
+    if totalSize <= CACHE_STATE["maxSize"]:
+        return
+
+    for key, size in connection.execute("SELECT key, size FROM results ORDER BY accessed").fetchall():
+        connection.execute("DELETE FROM results WHERE key = ?", (key,))
+        totalSize -= size
+        if totalSize <= CACHE_STATE["maxSize"]:
+            break
+
+
+@contextlib.contextmanager
+def _connection():
+    # a connection per use keeps the cache safe to use from the download threads, the lock serializes the writers of this process.
+    with CACHE_LOCK:
+        connection = sqlite3.connect(CACHE_STATE["path"], timeout=30)
+        try:
+            with connection:
+                yield connection
+        finally:
+            connection.close()
@@ -1,15 +1,19 @@
 import ee
+import time
 import datetime
 import tabulate
-ee.Initialize()
+import concurrent.futures
+from . import initialization
+from . import instrumentation
 
 
+# The reducers are created on demand, since ee.Reducer is only populated once Earth Engine has been initialized.
 REDUCERS = {
-    "firstNonNull": ee.Reducer.firstNonNull(),
-    "lastNonNull": ee.Reducer.lastNonNull(),
-    "median": ee.Reducer.median(),
-    "mean": ee.Reducer.mean(),
-    "min": ee.Reducer.min()
+    "firstNonNull": lambda: ee.Reducer.firstNonNull(),
+    "lastNonNull": lambda: ee.Reducer.lastNonNull(),
+    "median": lambda: ee.Reducer.median(),
+    "mean": lambda: ee.Reducer.mean(),
+    "min": lambda: ee.Reducer.min()
 }
 
 REDUCERPATTERNS = {
@@ -20,144 +24,370 @@ REDUCERPATTERNS = {
     "min": "_min"
 }
 
+TERMINAL_TASK_STATES = ["COMPLETED", "FAILED", "CANCELLED", "UNKNOWN"]
 
+# milliseconds per unit of the temporal gap filling window.
+WINDOW_UNITS = {
+    "week": 7 * 24 * 60 * 60 * 1000,
+    "day": 24 * 60 * 60 * 1000,
+    "hour": 60 * 60 * 1000,
+    "minute": 60 * 1000,
+    "second": 1000
+}
+
+# the suffix of the acquisition time bands added by _temporal_gap_filling.
+TIME_BAND_SUFFIX = "_geetils_time"
+
+
+@initialization._ensure_initialized
 def _temporal_collection_creator(collection, specifiedReducer, firstDatesList, secondDatesList, timeFormat: str = "YYYY-MM-dd",
                                  timeZone: str = "UTC"):
     """
     Description:
-      Returns an ee.List of image composites.
+      Returns an ee.ImageCollection of image composites, one for each date range that contains images.
     Arguments:
       collection        (ee.ImageCollection)  (mandatory): Self-explanatory.
-      specifiedReducer  (ee.Reducer)          (mandatory): The ee.Reducer to apply.
-      firstDatesList    (list)                (mandatory): A list containing the start dates of each sub date-range.
-      secondDatesList   (list)                (mandatory): A list containing the end dates of each sub date-range.
+      specifiedReducer  (str/list)            (mandatory): The name of the reducer to apply, or a list of names, from the keys of REDUCERS.
+      firstDatesList    (ee.List)             (mandatory): A list containing the start dates of each sub date-range.
+      secondDatesList   (ee.List)             (mandatory): A list containing the end dates of each sub date-range.
       timeFormat        (str)                 (mandatory): A datetime pattern. Defaults to "YYYY-MM-dd".
       timeZone          (str)                 (mandatory): The time zone. Defaults to "UTC".
     Notes:
       -The datetime pattern is  described at http://joda-time.sourceforge.net/apidocs/org/joda/time/format/DateTimeFormat.html
+      -Each date range includes its start date and excludes its end date, like ee.ImageCollection.filterDate.
+      -The images are matched to the date ranges with an ee.Join and each composite is computed independently of the others,
+      so the server is free to compute them in parallel.
+      -Date ranges without images are left out, in which case the composites are fewer than the date ranges.
+      -If specifiedReducer is a name, the bands of the composites keep the names of the input bands. If it is a list of names, the
+      reducers are combined into one, which computes every statistic in a single pass over the images, and each input band yields one
+      band per reducer, suffixed as in REDUCERPATTERNS (e.g. ["mean", "min"] turns band "B4" into "B4_mean" and "B4_min").
     """
     # Developer Notes:
     # By default resultant band names of the ".reduce(ee.Reducer.'reducer name')" functions will have the name of the reducer appended.
     # This is taken care of and band names are renamed once more to revome the trailing suffix.
 
+    # remove possible duplicate values from the reducer names, keeping their order.
+    reducerNames = [specifiedReducer] if isinstance(specifiedReducer, str) else list(dict.fromkeys(specifiedReducer))
+    if not reducerNames or any(reducerName not in REDUCERS for reducerName in reducerNames):
+        raise ValueError("Parameter specifiedReducer must be one of, or a list of, {}".format(list(REDUCERS.keys())))
+
     # Create a sequence of numbers, one for each time interval.
     sequence = ee.List.sequence(0, ee.Number(firstDatesList.size()).subtract(1))
 
-    def _inner_function(temp, imagesList):
-        imagesList = ee.List(imagesList)
-        # Get the start date of the current sequence.
+    def _date_range_feature_creator(temp):
+        # Get the start and end date of the current sequence.
         startDate = ee.Date(firstDatesList.get(temp))
-        # Get the end date of the current sequence.
         endDate = ee.Date(secondDatesList.get(temp))
+        return ee.Feature(None, {"geetils_start": startDate.millis(), "geetils_end": endDate.millis()})
 
-        temporalCollection = collection.filterDate(startDate, endDate)
+    dateRangesCollection = ee.FeatureCollection(sequence.map(_date_range_feature_creator))
+
+    # attach to each date range the list of its images, in chronological order.
+    dateRangeFilter = ee.Filter.And(ee.Filter.lessThanOrEquals(leftField="geetils_start", rightField="system:time_start"),
+                                    ee.Filter.greaterThan(leftField="geetils_end", rightField="system:time_start"))
+    join = ee.Join.saveAll(matchesKey="geetils_images", ordering="system:time_start")
+    dateRangesCollection = join.apply(dateRangesCollection, collection, dateRangeFilter)
+
+    def _inner_function(dateRange):
+        temporalCollection = ee.ImageCollection.fromImages(dateRange.get("geetils_images"))
         formattedAcquisitionDate = temporalCollection.first().date().format(timeFormat, timeZone)
 
-        # Apply the specified reducer and remove the trailing _"reducer name" from each image's bands.
-        image = temporalCollection.reduce(REDUCERS[specifiedReducer])
-        oldImageBands = image.bandNames()
-        newImageBands = oldImageBands.map(lambda bandName: ee.String(bandName).replace(REDUCERPATTERNS[specifiedReducer], ''))
-        image = image.select(oldImageBands).rename(newImageBands)
+        if isinstance(specifiedReducer, str):
+            # Apply the specified reducer and remove the trailing _"reducer name" from each image's bands.
+            image = temporalCollection.reduce(REDUCERS[specifiedReducer]())
+            oldImageBands = image.bandNames()
+            newImageBands = oldImageBands.map(lambda bandName: ee.String(bandName).replace(REDUCERPATTERNS[specifiedReducer], ''))
+            image = image.select(oldImageBands).rename(newImageBands)
+        else:
+            # the combined reducer names its outputs "<band name>_<output name>", which matches the suffixes of REDUCERPATTERNS.
+            image = temporalCollection.reduce(_combined_reducer_creator(reducerNames))
 
         image = image.set("system:time_start", formattedAcquisitionDate)
-        return imagesList.add(image)
+        return image
 
-    return ee.List(sequence.iterate(_inner_function, ee.List([])))
+    return ee.ImageCollection(dateRangesCollection.map(_inner_function))
 
 
-def _spatial_interpolation(image, radius: float = 1.5, kernelType: str = "circle", kernelUnit: str = "pixels", iterations: int = 1, kernel=None):
+def _combined_reducer_creator(reducerNames: list):
+    """
+    Description:
+      Returns a single ee.Reducer which computes the statistics of all the provided reducers with shared inputs.
+    Arguments:
+      reducerNames  (list)  (mandatory): A list of names from the keys of REDUCERS.
+    Notes:
+      None.
+    """
+    combinedReducer = REDUCERS[reducerNames[0]]()
+    for reducerName in reducerNames[1:]:
+        combinedReducer = combinedReducer.combine(reducer2=REDUCERS[reducerName](), sharedInputs=True)
+    return combinedReducer
+
+
+@initialization._ensure_initialized
+def _spatial_interpolation(image, radius: float = 1.5, kernelType: str = "circle", kernelUnit: str = "pixels", iterations: int = 1, kernel=None,
+                           pyramidLevels: int = 0, projection=None):
     """
     Description:
         Applies a morphological mean filter to each band of an image using a named or custom kernel.
     Arguments:
-        image       (ee.Image)      (mandatory): The image to which to apply the operations.
-        radius      (float)         (optional):  The radius of the kernel to use. Defaults to 1.5.
-        kernelType  (str)           (optional):  The type of kernel to use. Defaults to circle.
-        kernelUnit  (str)           (optional):  If a kernel is not specified, this determines the kernel's unit.
-        iterations  (int)           (optional):  The number of times to apply the given kernel. Defaults to 1
-        kernel      (ee.Kernel)     (optional):  A custom kernel. If used, kernelType and radius are ignored. Defaults to None.
+        image           (ee.Image)      (mandatory): The image to which to apply the operations.
+        radius          (float)         (optional):  The radius of the kernel to use. Defaults to 1.5.
+        kernelType      (str)           (optional):  The type of kernel to use. Defaults to circle.
+        kernelUnit      (str)           (optional):  If a kernel is not specified, this determines the kernel's unit.
+        iterations      (int)           (optional):  The number of times to apply the given kernel. Defaults to 1
+        kernel          (ee.Kernel)     (optional):  A custom kernel. If used, kernelType and radius are ignored. Defaults to None.
+        pyramidLevels   (int)           (optional):  The number of coarser levels to fill the remaining gaps from. Defaults to 0.
+        projection      (ee.Projection) (optional):  The native projection of the image. Defaults to the projection of its first band.
     Notes:
         -Argument kernelUnit must be one of: 'meters', 'pixels'.
         -Argument kernelType argument must be one of: 'circle', 'square', 'cross', 'plus', octagon' and 'diamond'.
         -It is worth adjusting the radius and iteration parameters. The larger these values the greater the blurring on the data.
         -Argument kernel defaults to None. If you parse anything in here you will override the kernelType parameter.
+        -If the argument pyramidLevels is positive, level k is the mean of 2x2 pixels of level k - 1 (level 0 being the image), filtered
+        with the same kernel. Gaps left at a level are filled from the next coarser one and the levels are blended back down to the
+        native scale. With kernelUnit 'pixels' the kernel grows with the pixels of each level, so holes of about radius * 2 ** pyramidLevels
+        pixels are filled at the cost of a few small kernels. With kernelUnit 'meters' (or a custom kernel in meters) the kernel keeps its
+        size at every level, so the coarser levels only fill the holes that their own pixels, of 2 ** k native pixels, reach.
+        -Composites have no native projection (see ee.ImageCollection.reduce), hence need the argument projection for a pyramid, e.g.
+        ee.Projection("EPSG:4326").atScale(10), which is set as the default projection of the image the pyramid is reduced from.
     """
-    filled = image.focal_mean(radius, kernelType, kernelUnit, iterations, kernel)
-    result = ee.Image(filled).blend(image)  # blend the focal_mean result with the initial input image.
+    filled = ee.Image(image.focal_mean(radius, kernelType, kernelUnit, iterations, kernel))
+
+    if pyramidLevels > 0:
+        # the pyramid starts from the native pixels, which a composite only has once its default projection is set.
+        if projection is None:
+            projection = ee.Image(image).select(0).projection()
+            level = ee.Image(image)
+        else:
+            level = ee.Image(image).setDefaultProjection(projection)
+
+        # each level is reduced from the previous one, so no reduction spans more than 2x2 pixels.
+        levels = []
+        for levelNumber in range(1, pyramidLevels + 1):
+            level = level.reduceResolution(ee.Reducer.mean(), False, 16).reproject(projection.scale(2 ** levelNumber, 2 ** levelNumber))
+            levels.append(ee.Image(level.focal_mean(radius, kernelType, kernelUnit, iterations, kernel)))
+
+        # blend from the coarsest level down to the native one, each finer level overlaying the coarser ones where it holds data.
+        pyramid = levels[-1]
+        for levelFilled in reversed(levels[:-1]):
+            pyramid = pyramid.blend(levelFilled)
+        filled = pyramid.blend(filled)
+
+    result = filled.blend(image)  # blend the focal_mean result with the initial input image.
     result = result.copyProperties(image, ee.Image(image).propertyNames())
     return ee.Image(result)
 
 
-def _sentinel2_coverage(collection):
+@initialization._ensure_initialized
+def _temporal_gap_filling(collection, window: int = 30, unit: str = "day"):
     """
     Description:
-        Depicts a table containing information about the image collection.
-        Table columns:
-            Orbit:  The relative orbit number.
-            Tiles:  The mgrs tiles.
-            Dates:  The acquisition dates.
+        Returns an ee.ImageCollection in which each masked pixel of each image is filled by linear interpolation in time between the
+        nearest clear observations before and after it, within a time window.
     Arguments:
         collection  (ee.ImageCollection)    (mandatory): Self-explanatory.
+        window      (int)                   (optional):  The maximum time between an image and the observations it is filled from.
+                                                         Defaults to 30.
+        unit        (str)                   (optional):  The unit of window. Defaults to day.
     Notes:
-        None.
+        -Argument unit must be one of "week", "day", "hour", "minute" or "second".
+        -The observations before and after each image are attached by two ee.Join.saveAll joins and every image is filled independently
+        in a single map, so the server is free to fill them in parallel.
+        -Each band is interpolated on its own, weighted by the acquisition times of the observations clear at each pixel. A pixel with
+        a clear observation on one side only takes its value, and a pixel with none within the window stays masked.
+        -The filled bands are of type double and the properties of each image are kept, so the result can be passed on to
+        _temporal_collection_creator or to the batch exporters.
     """
-    headers = ["Orbit", "Tiles", "Dates"]
+    if unit not in WINDOW_UNITS:
+        raise ValueError("Parameter unit must be one of {}".format(list(WINDOW_UNITS.keys())))
+
+    def _time_band_adder(image):
+        # time bands with the masks of their bands, named "<band name>_geetils_time".
+        timeBandNames = image.bandNames().map(lambda bandName: ee.String(bandName).cat(TIME_BAND_SUFFIX))
+        return image.addBands(image.toDouble().multiply(0).add(image.date().millis()).rename(timeBandNames))
+
+    timedCollection = collection.map(_time_band_adder)
 
-    def _inner_function(orbit, collectionProperty: str):
-        return collection.filter(ee.Filter.eq('SENSING_ORBIT_NUMBER', orbit)).aggregate_array(collectionProperty).distinct().sort()
+    withinWindow = ee.Filter.maxDifference(difference=window * WINDOW_UNITS[unit], leftField="system:time_start",
+                                           rightField="system:time_start")
+    beforeFilter = ee.Filter.And(withinWindow, ee.Filter.greaterThan(leftField="system:time_start", rightField="system:time_start"))
+    afterFilter = ee.Filter.And(withinWindow, ee.Filter.lessThan(leftField="system:time_start", rightField="system:time_start"))
 
-    def _inner_date_formatter(tempIndex):
-        tempList = ee.List(datesList.get(tempIndex))
-        return tempList.map(lambda date: ee.Date(date).format("YYYY-mm-dd"))
+    # the nearest observations come last, hence on top of the mosaics.
+    joinedCollection = ee.Join.saveAll(matchesKey="geetils_before", ordering="system:time_start", ascending=True).apply(
+        timedCollection, timedCollection, beforeFilter)
+    joinedCollection = ee.Join.saveAll(matchesKey="geetils_after", ordering="system:time_start", ascending=False).apply(
+        joinedCollection, timedCollection, afterFilter)
 
-    sensingOrbitNumbersList = collection.aggregate_array('SENSING_ORBIT_NUMBER').distinct()
+    def _inner_function(image):
+        image = ee.Image(image)
+        bandNames = image.bandNames().filter(ee.Filter.stringEndsWith("item", TIME_BAND_SUFFIX).Not())
+        timeBandNames = bandNames.map(lambda bandName: ee.String(bandName).cat(TIME_BAND_SUFFIX))
 
-    mgrsTilesList = sensingOrbitNumbersList.map(lambda orbit: _inner_function(orbit, "MGRS_TILE"))
-    datesList = sensingOrbitNumbersList.map(lambda orbit: _inner_function(orbit, "system:time_start"))
+        # a fully masked image keeps the mosaics well formed when there is no observation on one side.
+        emptyImage = image.updateMask(0)
+        before = ee.ImageCollection.fromImages(ee.List([emptyImage]).cat(ee.List(image.get("geetils_before")))).mosaic()
+        after = ee.ImageCollection.fromImages(ee.List([emptyImage]).cat(ee.List(image.get("geetils_after")))).mosaic()
 
-    dateListSequence = ee.List.sequence(0, datesList.size().subtract(1))
+        beforeValues = before.select(bandNames).toDouble()
+        afterValues = after.select(bandNames).toDouble()
+        beforeTimes = before.select(timeBandNames).rename(bandNames)
+        afterTimes = after.select(timeBandNames).rename(bandNames)
 
-    datesList = dateListSequence.map(_inner_date_formatter)
+        weight = ee.Image.constant(image.date().millis()).subtract(beforeTimes).divide(afterTimes.subtract(beforeTimes))
+        interpolated = beforeValues.add(afterValues.subtract(beforeValues).multiply(weight))
 
-    table = zip(sensingOrbitNumbersList.getInfo(), mgrsTilesList.getInfo(), datesList.getInfo())
-    print(tabulate.tabulate(table, headers=headers, floatfmt=".4f"))
+        # interpolated where both sides are clear, else the clear side, and the image itself where it is clear.
+        filled = afterValues.blend(beforeValues).blend(interpolated).blend(image.select(bandNames).toDouble())
+        propertyNames = image.propertyNames().removeAll(["geetils_before", "geetils_after"])
+        return ee.Image(filled.copyProperties(image, propertyNames))
 
+    return ee.ImageCollection(joinedCollection.map(_inner_function))
 
-def _landsat_coverage(collection):
+
+@initialization._ensure_initialized
+def _sentinel2_coverage(collection, display: bool = True):
     """
     Description:
-        Depicts a table containing information about the image collection.
+        Depicts a table containing information about the image collection and returns its rows.
         Table columns:
             Orbit:  The relative orbit number.
             Tiles:  The mgrs tiles.
             Dates:  The acquisition dates.
     Arguments:
         collection  (ee.ImageCollection)    (mandatory): Self-explanatory.
+        display     (bool)                  (optional): Whether to print the table. Defaults to True.
+    Notes:
+        -Returns a list of dictionaries with the keys "orbit", "tiles" and "dates", sorted by orbit (see _coverage_table_creator).
+    """
+    return _coverage_table_creator(collection, "SENSING_ORBIT_NUMBER", "MGRS_TILE", ["orbit", "tiles", "dates"], display)
+
+
+@initialization._ensure_initialized
+def _landsat_coverage(collection, display: bool = True):
+    """
+    Description:
+        Depicts a table containing information about the image collection and returns its rows.
+        Table columns:
+            Path:   The WRS path.
+            Rows:   The WRS rows.
+            Dates:  The acquisition dates.
+    Arguments:
+        collection  (ee.ImageCollection)    (mandatory): Self-explanatory.
+        display     (bool)                  (optional): Whether to print the table. Defaults to True.
+    Notes:
+        -Returns a list of dictionaries with the keys "path", "rows" and "dates", sorted by path (see _coverage_table_creator).
+    """
+    return _coverage_table_creator(collection, "WRS_PATH", "WRS_ROW", ["path", "rows", "dates"], display)
+
+
+@initialization._ensure_initialized
+def _coverage_table_creator(collection, groupProperty: str, tileProperty: str, keys: list, display: bool = True):
+    """
+    Description:
+        Returns, and optionally prints, the distinct tiles and acquisition dates of an image collection per group (e.g. orbit or path).
+    Arguments:
+        collection      (ee.ImageCollection)    (mandatory): Self-explanatory.
+        groupProperty   (str)                   (mandatory): The property the images are grouped by (e.g. "WRS_PATH").
+        tileProperty    (str)                   (mandatory): The property of the tiles within a group (e.g. "WRS_ROW").
+        keys            (list)                  (mandatory): The keys of the group, tiles and dates in each row, capitalized as headers.
+        display         (bool)                  (optional): Whether to print the table. Defaults to True.
+    Notes:
+        -The whole table is a single grouped reduction, evaluated with a single getInfo no matter the number of groups or images.
+        -The acquisition dates are formatted on the client as YYYY-MM-dd, in UTC.
+    """
+    reducer = ee.Reducer.toList(2).group(groupField=0, groupName="group")
+    groupsList = instrumentation._get_info(collection.reduceColumns(reducer, [groupProperty, tileProperty, "system:time_start"]))["groups"]
+
+    rows = []
+    for group in sorted(groupsList, key=lambda item: item["group"]):
+        tiles = sorted(set(pair[0] for pair in group["list"]))
+        dates = sorted(set(datetime.datetime.fromtimestamp(pair[1] / 1000.0, tz=datetime.timezone.utc).strftime("%Y-%m-%d")
+                           for pair in group["list"]))
+        rows.append(dict(zip(keys, [group["group"], tiles, dates])))
+
+    if display:
+        headers = [key.capitalize() for key in keys]
+        print(tabulate.tabulate([[row[key] for key in keys] for row in rows], headers=headers, floatfmt=".4f"))
+
+    return rows
+
+
+@initialization._ensure_initialized
+def _export_tasks_status_retriever(exportTasksIdsList, bulkThreshold: int = 500, maxWorkers: int = 8):
+    """
+    Description:
+      Returns a dictionary from export task id to export task status.
+    Arguments:
+      exportTasksIdsList: (list)  (mandatory): the list of export tasks.
+      bulkThreshold:      (int)   (optional): The number of tasks above which the whole task list is retrieved at once. Defaults to 500.
+                                              None never retrieves it.
+      maxWorkers:         (int)   (optional): The maximum number of concurrent ee.data.getTaskStatus requests. Defaults to 8.
+    Notes:
+      -ee.data.getTaskStatus costs a request per task, while ee.data.getTaskList pages, by 500, through every task the project has ever
+      run, so its cost grows with the project's history and not with the requested tasks. Hence the statuses are only read from the task
+      list above bulkThreshold tasks, where a request per task would cost as much as the task list of a project with 500 times as many
+      tasks. Tasks missing from the task list, and all tasks up to bulkThreshold, are queried through ee.data.getTaskStatus, one request
+      per task, up to maxWorkers of them at once.
+      -The statuses are retrieved by separate requests, hence are not a consistent snapshot of a single instant.
+      -Tasks unknown to the server have the state "UNKNOWN".
+    """
+    statusDictionary = {}
+
+    if bulkThreshold is not None and len(exportTasksIdsList) > bulkThreshold:
+        requestedIds = set(exportTasksIdsList)
+        statusDictionary = {task["id"]: task for task in instrumentation._get_task_list() if task["id"] in requestedIds}
+
+    missingIds = [exportTaskId for exportTaskId in exportTasksIdsList if exportTaskId not in statusDictionary]
+
+    # the requests are bound by the network and not by the interpreter, thus threads suffice.
+    with concurrent.futures.ThreadPoolExecutor(max_workers=maxWorkers) as executor:
+        for taskStatusList in executor.map(lambda exportTaskId: instrumentation._get_task_status([exportTaskId]), missingIds):
+            for task in taskStatusList:
+                statusDictionary[task["id"]] = task
+
+    return statusDictionary
+
+
+def _task_info_creator(taskStatus: dict):
+    """
+    Description:
+      Returns the row of the export tasks table that corresponds to the provided export task status.
+    Arguments:
+      taskStatus: (dict)  (mandatory): The export task status, as returned by ee.data.getTaskStatus.
     Notes:
-        None.
+      None.
     """
-    headers = ["Orbit", "Tiles", "Dates"]
+    taskState = taskStatus["state"]
 
-    def _inner_function(path, collectionProperty: str):
-        return collection.filter(ee.Filter.eq('WRS_PATH', path)).aggregate_array(collectionProperty).distinct().sort()
+    queueTime = None
+    taskAttempt = None
+    executionTime = None
+    completionTime = None
 
-    def _inner_date_formatter(tempIndex):
-        tempList = ee.List(datesList.get(tempIndex))
-        return tempList.map(lambda date: ee.Date(date).format("YYYY-mm-dd"))
+    # tasks cancelled while still queued have never started.
+    if taskState not in ["READY", "RUNNING", "UNKNOWN"] and "start_timestamp_ms" in taskStatus:
+        startTaskTimestamp = datetime.datetime.fromtimestamp(taskStatus["start_timestamp_ms"] / 1000.0)
+        updateTaskTimestamp = datetime.datetime.fromtimestamp(taskStatus["update_timestamp_ms"] / 1000.0)
+        creationTaskTimestamp = datetime.datetime.fromtimestamp(taskStatus["creation_timestamp_ms"] / 1000.0)
 
-    wrsPathsList = collection.aggregate_array('WRS_PATH').distinct()
-    wrsRowsList = wrsPathsList.map(lambda path: _inner_function(path, "WRS_ROW"))
-    datesList = wrsPathsList.map(lambda path: _inner_function(path, "system:time_start"))
+        queueTime = (startTaskTimestamp - creationTaskTimestamp).total_seconds()
+        executionTime = (updateTaskTimestamp - startTaskTimestamp).total_seconds()
 
-    dateListSequence = ee.List.sequence(0, datesList.size().subtract(1))
+        if taskState == "COMPLETED":
+            taskAttempt = taskStatus.get("attempt")
+            completionTime = (updateTaskTimestamp - creationTaskTimestamp).total_seconds()
 
-    datesList = dateListSequence.map(_inner_date_formatter)
+    # a missing error message just means that the export task has not failed.
+    errorMessage = taskStatus.get("error_message")
 
-    table = zip(wrsPathsList.getInfo(), wrsRowsList.getInfo(), datesList.getInfo())
-    print(tabulate.tabulate(table, headers=headers, floatfmt=".4f"))
+    return [taskStatus["id"], taskState, taskStatus.get("task_type"), taskAttempt, taskStatus.get("description"), queueTime, executionTime,
+            completionTime, errorMessage]
 
 
-def _export_tasks_viewer(exportTasksIdsList, tableFormat: str = "plain"):
+@initialization._ensure_initialized
+def _export_tasks_viewer(exportTasksIdsList, tableFormat: str = "plain", watch: bool = False, runningInterval: float = 10,
+                         queuedInterval: float = 60):
     """
     Description:
       Depicts a table containing information about the export tasks passed.
@@ -170,11 +400,15 @@ def _export_tasks_viewer(exportTasksIdsList, tableFormat: str = "plain"):
     Arguments:
       exportTasksIdsList: (list)  (mandatory): the list of export tasks.
       tableFormat:        (str)   (optional): The table format which will be used for the display. Defaults to "plain".
+      watch:              (bool)  (optional): Whether to refresh the table until every task has terminated. Defaults to False.
+      runningInterval:    (float) (optional): The seconds between refreshes while any task is running. Defaults to 10.
+      queuedInterval:     (float) (optional): The seconds between refreshes while the unfinished tasks are all queued. Defaults to 60.
     Notes:
       -Argument tableFormat must be one of: "simple", "plain", "grid", "fancy_grid", "github", "pipe", "orgtbl", "jira",
       "presto", "psql", "rst", "mediawiki", "moinmoin", "youtrack", "html", "latex", "latex_raw", "latex_booktabs", "tsv", "textile".
+      -Each table is built from a single retrieval of the task statuses (see _export_tasks_status_retriever).
+      -A task has terminated when its state is one of: "COMPLETED", "FAILED", "CANCELLED", "UNKNOWN".
     """
-    taskInfoList = []
     tableHeaders = ["Task_Id", "Task_State", "Task_Type", "Task_Attempt", "Task_Description", "Queue_Time", "Execution_Time", "Completion_Time",
                     "Error_Message"]
     tableFormats = ["simple", "plain", "grid", "fancy_grid", "github", "pipe", "orgtbl", "jira", "presto", "psql", "rst",
@@ -183,37 +417,19 @@ def _export_tasks_viewer(exportTasksIdsList, tableFormat: str = "plain"):
     if tableFormat not in tableFormats:
         raise ValueError("Parameter tableFormat must be one of {}".format(tableFormats))
 
-    # populate taskInfoList.
-    for exportTaskId in exportTasksIdsList:
-
-        taskState = ee.data.getTaskStatus(exportTaskId)[0]["state"]
-        taskType = ee.data.getTaskStatus(exportTaskId)[0]["task_type"]
-        taskDescription = ee.data.getTaskStatus(exportTaskId)[0]["description"]
-
-        startTaskTimestamp = datetime.datetime.fromtimestamp(ee.data.getTaskStatus(exportTaskId)[0]["start_timestamp_ms"] / 1000.0)
-        updateTaskTimestamp = datetime.datetime.fromtimestamp(ee.data.getTaskStatus(exportTaskId)[0]["update_timestamp_ms"] / 1000.0)
-        creationTaskTimestamp = datetime.datetime.fromtimestamp(ee.data.getTaskStatus(exportTaskId)[0]["creation_timestamp_ms"] / 1000.0)
+    while True:
+        statusDictionary = _export_tasks_status_retriever(exportTasksIdsList)
 
-        queueTime = None
-        taskAttempt = None
-        executionTime = None
-        completionTime = None
-
-        if taskState not in ["READY", "RUNNING"]:
-            queueTime = (startTaskTimestamp - creationTaskTimestamp).total_seconds()
-            executionTime = (updateTaskTimestamp - startTaskTimestamp).total_seconds()
-
-        if taskState == "COMPLETED":
-            taskAttempt = ee.data.getTaskStatus(exportTaskId)[0]["attempt"]
-            completionTime = (updateTaskTimestamp - creationTaskTimestamp).total_seconds()
+        # populate taskInfoList.
+        taskInfoList = [_task_info_creator(statusDictionary[exportTaskId]) for exportTaskId in exportTasksIdsList]
 
-        try:
-            errorMessage = ee.data.getTaskStatus(exportTaskId)[0]["error_message"]
-        except KeyError:
-            errorMessage = None  # this just means that the export task has not failed.
+        # table display.
+        table = tabulate.tabulate(taskInfoList, headers=tableHeaders, tablefmt=tableFormat)
+        print(table)
 
-        taskInfoList.append([exportTaskId, taskState, taskType, taskAttempt, taskDescription, queueTime, executionTime, completionTime, errorMessage])
+        taskStates = [taskInfo[1] for taskInfo in taskInfoList]
+        if not watch or all(taskState in TERMINAL_TASK_STATES for taskState in taskStates):
+            break
 
-    # table display.
-    table = tabulate.tabulate(taskInfoList, headers=tableHeaders, tablefmt=tableFormat)
-    print(table)
+        # poll faster while tasks are making progress than while they are waiting in the queue.
+        time.sleep(runningInterval if "RUNNING" in taskStates else queuedInterval)
@@ -1,89 +1,287 @@
 import ee
+import re
+import calendar
+import datetime
+import functools
+import zoneinfo
+from . import initialization
+from . import instrumentation
 
 """
 Utilizing the static methods of Google Earth Engine's Python API this module includes functions to handle the process of creating custom date ranges.
 """
 
+UNITS = ["year", "month", "week", "day", "hour", "minute", "second"]
 
-def _acquisition_date_extractor(collection, dateProperty: str, timeFormat: str = "YYYY-MM-dd", timeZone: str = "UTC"):
+# serialized acquisition dates expression to the retrieved acquisition dates, filled by _acquisition_date_extractor.
+ACQUISITION_DATES_CACHE = {}
+
+# Joda-Time pattern letters, as used by ee.Date.format, and their strftime equivalents.
+JODA_TO_STRFTIME = {
+    "yyyy": "%Y",
+    "YYYY": "%Y",
+    "yy": "%y",
+    "YY": "%y",
+    "MMMM": "%B",
+    "MMM": "%b",
+    "MM": "%m",
+    "dd": "%d",
+    "DDD": "%j",
+    "EEEE": "%A",
+    "EEE": "%a",
+    "HH": "%H",
+    "mm": "%M",
+    "ss": "%S"
+}
+
+
+@initialization._ensure_initialized
+def _acquisition_date_extractor(collection, dateProperty: str, timeFormat: str = "YYYY-MM-dd", timeZone: str = "UTC", dayLevel: bool = False,
+                                cache: bool = False):
     """
   Description:
     Returns a sorted ee.List of distinct acquisition dates.
   Arguments:
     collection  (ee.Image/ee.ImageCollection)   (mandatory):  The image collection.
+    dateProperty (str)                          (mandatory):  The property holding the acquisition date (e.g. 'system:time_start').
     timeFormat  (str)                           (mandatory):  A datetime pattern. Defaults to None.
     timeZone    (str)                           (mandatory):  The time zone (e.g. 'America/Los_Angeles'). Defaults to UTC.
+    dayLevel    (bool)                          (optional):   Whether to keep a single date per day. Defaults to False.
+    cache       (bool)                          (optional):   Whether to retrieve the dates and keep them on the client. Defaults to False.
   Notes:
     -List of time zones:  https://www.joda.org/joda-time/timezones.html
     -Reference for Joda-Time format characters:  http://joda-time.sourceforge.net/apidocs/org/joda/time/format/DateTimeFormat.html
+    -The dates are gathered with aggregate_array and formatted with a map, so the server formats them in parallel.
+    -If the argument dayLevel is True, the dates are deduplicated by day in timeZone before being formatted and any time of day in
+    timeFormat is midnight.
+    -If the argument cache is True the dates are retrieved with a single getInfo and kept in ACQUISITION_DATES_CACHE, keyed on the
+    serialized expression (collection, filters and arguments included), so repeating the call returns instantly. The result is then an
+    ee.List of the retrieved dates. With the disk cache enabled (see cache._enable) they are also kept across sessions.
   """
+    datesList = collection.aggregate_array(dateProperty)
+
+    if dayLevel:
+        datesList = datesList.map(lambda date: ee.Date(date).format("YYYY-MM-dd", timeZone)).distinct()
+        datesList = datesList.map(lambda day: ee.Date.parse("YYYY-MM-dd", day, timeZone).format(timeFormat, timeZone))
+    else:
+        datesList = datesList.map(lambda date: ee.Date(date).format(timeFormat, timeZone))
 
-    def _inner_function(image, newList):
-        date = ee.Date(image.get(dateProperty)).format(timeFormat, timeZone)
-        newList = ee.List(newList)
-        return newList.add(date)
+    datesList = datesList.distinct().sort()
 
-    # typecasting to retrieve the result as an ee.List and not computedObject.
-    return ee.List(collection.iterate(_inner_function, ee.List([]))).distinct().sort()
+    if not cache:
+        return datesList
 
+    expression = datesList.serialize()
+    if expression not in ACQUISITION_DATES_CACHE:
+        ACQUISITION_DATES_CACHE[expression] = instrumentation._get_info(datesList)
 
+    return ee.List(ACQUISITION_DATES_CACHE[expression])
+
+
+@initialization._ensure_initialized
 def _date_range_creator_from_dates(startDate, endDate, interval: int = 1, unit: str = "month", timeZone: str = "UTC"):
     """
   Description:
     Returns an ee.List of ee.DateRange objects by increments of interval in specified units.
   Arguments:
-    startDate   (ee.Date)   (mandatory): the start date.
-    endDate     (ee.Date)   (mandatory): the end date.
-    interval    (int)       (optional): self-explanatory. Defaults to 1.
-    unit        (str)       (optional): specified unit type to advance. Defaults to month.
-    timeZone    (str)       (optional): the time zone in which to interpret the start and end dates. Defaults to UTC.
+    startDate   (ee.Date/str/datetime)  (mandatory): the start date.
+    endDate     (ee.Date/str/datetime)  (mandatory): the end date.
+    interval    (int)                   (optional): self-explanatory. Defaults to 1.
+    unit        (str)                   (optional): specified unit type to advance. Defaults to month.
+    timeZone    (str)                   (optional): the time zone in which to interpret the start and end dates. Defaults to UTC.
   Notes:
     -An example ee.DateRange object follows: {"type": "DateRange", "dates": [1546300800000, 1548979200000]}.
     -Argument unit must be one of "year", "month" "week", "day", "hour", "minute", or "second".
+    -If the start and end dates are ISO 8601 strings (e.g. "2020-01-31") or datetime objects, the date ranges are computed on the client
+    (see _client_date_range_creator) and sent as a literal list, otherwise they are computed on the server. Both follow the same rule:
+    the i-th range runs from the start date advanced by i * interval units to the start date advanced by (i + 1) * interval units, and
+    only the ranges that end by the end date are kept, so e.g. "2020-02-01" to "2020-03-01" by 1 month is one range either way.
   """
 
     def _inner_function(temp, dateRangeList):
         dateRangeList = ee.List(dateRangeList)
         firstDate = startDate.advance(ee.Number(interval).multiply(temp), unit, timeZone)
-        lastDate = firstDate.advance(interval, unit, timeZone)
-        return dateRangeList.add(ee.DateRange(firstDate, lastDate, timeZone))
+        lastDate = startDate.advance(ee.Number(interval).multiply(ee.Number(temp).add(1)), unit, timeZone)
+        # the candidates past the end date are dropped, so that only whole calendar units are counted.
+        return ee.List(ee.Algorithms.If(lastDate.millis().lte(endDate.millis()), dateRangeList.add(ee.DateRange(firstDate, lastDate, timeZone)),
+                                        dateRangeList))
+
+    if unit not in UNITS:
+        raise ValueError("Parameter unit must be one of {}".format(UNITS))
 
-    units = ["year", "month", "week", "day", "hour", "minute", "second"]
-    if unit not in units:
-        raise ValueError("Parameter unit must be one of {}".format(units))
+    if isinstance(startDate, (str, datetime.date)) and isinstance(endDate, (str, datetime.date)):
+        dateRanges = _client_date_range_creator(startDate, endDate, interval, unit, timeZone)
+        return ee.List([ee.DateRange(firstMillis, lastMillis, timeZone) for firstMillis, lastMillis in dateRanges])
 
     # get the difference between the start and end date in the specified unit.
     rangeDifference = endDate.difference(startDate, unit)
-    # determine the multiplicity of interval.
-    rangeTotal = rangeDifference.divide(interval).toInt()
+    # the difference is based on the average length of the unit, so it may fall short of the calendar count by a fraction of an interval
+    # (e.g. February counts 0.95 months), hence one candidate more than its whole part.
+    rangeTotal = rangeDifference.divide(interval).floor().add(1)
 
-    # rangeSequence = ee.List.sequence(0, ee.Number(rangeTotal))
     rangeSequence = ee.List.sequence(0, ee.Number(rangeTotal).subtract(1))
     return ee.List(rangeSequence.iterate(_inner_function, ee.List([])))
 
 
+@initialization._ensure_initialized
 def _date_range_creator_from_list(datesList, interval: int = 1, unit: str = "month", timeFormat: str = "YYYY-MM-dd", timeZone: str = "UTC"):
     """
   Description:
-    Returns an ee.List of ee.DateRange objects by increments of interval in specified units.
+    Returns an ee.List of dates by increments of interval in specified units, each one the respective date of datesList advanced.
   Arguments:
-    endDate     (ee.List)   (mandatory): An ee.List of dates.
-    interval    (int)       (optional): self-explanatory. Defaults to 1.
-    unit        (str)       (optional): specified unit type to advance. Defaults to month.
-    timeZone    (str)       (optional): the time zone in which to interpret the start and end dates. Defaults to UTC.
+    datesList   (ee.List/list)  (mandatory): An ee.List of dates, or a list of ISO 8601 strings or datetime objects.
+    interval    (int)           (optional): self-explanatory. Defaults to 1.
+    unit        (str)           (optional): specified unit type to advance. Defaults to month.
+    timeFormat  (str)           (optional): A datetime pattern. Defaults to "YYYY-MM-dd".
+    timeZone    (str)           (optional): the time zone in which to interpret the start and end dates. Defaults to UTC.
   Notes:
-    -An example ee.DateRange object follows: {"type": "DateRange", "dates": [1546300800000, 1548979200000]}.
     -Argument unit must be one of "year", "month" "week", "day", "hour", "minute", or "second".
+    -If datesList is a python list, the dates are advanced on the client and, if the pattern only contains letters of JODA_TO_STRFTIME,
+    formatted on the client as well, so that a literal list is sent to the server.
   """
 
     def _inner_function(temp, secondDateList):
         secondDateList = ee.List(secondDateList)
         return secondDateList.add(ee.Date(datesList.get(temp)).advance(interval, unit, timeZone).format(timeFormat, timeZone))
 
-    units = ["year", "month", "week", "day", "hour", "minute", "second"]
-    if unit not in units:
-        raise ValueError("Parameter unit must be one of {}".format(units))
+    if unit not in UNITS:
+        raise ValueError("Parameter unit must be one of {}".format(UNITS))
+
+    if isinstance(datesList, (list, tuple)):
+        advancedDates = _client_date_advancer(tuple(datesList), interval, unit, timeZone)
+        strftimeFormat = _joda_to_strftime(timeFormat)
+
+        if strftimeFormat is None:
+            # the pattern is formatted on the server, but every date independently of the others.
+            return ee.List([ee.Date(int(advancedDate.timestamp() * 1000)).format(timeFormat, timeZone) for advancedDate in advancedDates])
+        return ee.List([advancedDate.strftime(strftimeFormat) for advancedDate in advancedDates])
 
     dateSequence = ee.List.sequence(0, datesList.size().subtract(1))
 
     return ee.List(dateSequence.iterate(_inner_function, ee.List([])))
+
+
+def _date_parser(date, timeZone: str):
+    """
+  Description:
+    Returns a time zone aware datetime.datetime object from an ISO 8601 string or a datetime object.
+  Arguments:
+    date        (str/datetime)  (mandatory): Self-explanatory.
+    timeZone    (str)           (mandatory): The time zone in which to interpret dates without one.
+  Notes:
+    -Dates that carry a time zone are converted to timeZone.
+  """
+    zone = zoneinfo.ZoneInfo(timeZone)
+
+    if isinstance(date, str):
+        date = datetime.datetime.fromisoformat(date)
+    elif not isinstance(date, datetime.datetime):
+        date = datetime.datetime(date.year, date.month, date.day)
+
+    if date.tzinfo is None:
+        return date.replace(tzinfo=zone)
+    return date.astimezone(zone)
+
+
+def _date_advancer(date, delta: int, unit: str):
+    """
+  Description:
+    Returns a time zone aware datetime.datetime object advanced by delta units, like ee.Date.advance.
+  Arguments:
+    date    (datetime)  (mandatory): A time zone aware datetime.datetime object.
+    delta   (int)       (mandatory): Self-explanatory.
+    unit    (str)       (mandatory): One of UNITS.
+  Notes:
+    -Years, months, weeks and days are calendar units: the wall clock time is kept across daylight saving time changes and, as in
+    Joda-Time, the day of the month is clamped to the last day of the resulting month (e.g. "2020-01-31" plus one month is "2020-02-29").
+    -Hours, minutes and seconds are exact durations.
+  """
+    if unit in ["year", "month"]:
+        months = date.month - 1 + delta * (12 if unit == "year" else 1)
+        year = date.year + months // 12
+        month = months % 12 + 1
+        return date.replace(year=year, month=month, day=min(date.day, calendar.monthrange(year, month)[1]))
+
+    if unit in ["week", "day"]:
+        # arithmetic on aware datetime objects is wall clock arithmetic, which is what calendar units need.
+        return date + datetime.timedelta(days=delta * (7 if unit == "week" else 1))
+
+    utcDate = date.astimezone(datetime.timezone.utc) + datetime.timedelta(**{"{}s".format(unit): delta})
+    return utcDate.astimezone(date.tzinfo)
+
+
+@functools.lru_cache(maxsize=256)
+def _client_date_range_creator(startDate, endDate, interval: int = 1, unit: str = "month", timeZone: str = "UTC"):
+    """
+  Description:
+    Returns a tuple of (start, end) pairs, in milliseconds since the epoch, by increments of interval in specified units.
+  Arguments:
+    startDate   (str/datetime)  (mandatory): the start date, as an ISO 8601 string or a datetime object.
+    endDate     (str/datetime)  (mandatory): the end date, as an ISO 8601 string or a datetime object.
+    interval    (int)           (optional): self-explanatory. Defaults to 1.
+    unit        (str)           (optional): specified unit type to advance. Defaults to month.
+    timeZone    (str)           (optional): the time zone in which to interpret the start and end dates. Defaults to UTC.
+  Notes:
+    -The i-th range runs from the start date advanced by i * interval units to the start date advanced by (i + 1) * interval units, in
+    calendar units (see _date_advancer), and only ranges that end by the end date are kept. Hence the ranges are contiguous and, e.g.,
+    "2020-02-01" to "2020-03-01" by 1 month is one range.
+    -Equals the server side computation of _date_range_creator_from_dates for ee.Date arguments.
+    -Results are memoized, hence repeated calls with the same arguments cost nothing.
+  """
+    if unit not in UNITS:
+        raise ValueError("Parameter unit must be one of {}".format(UNITS))
+    if interval < 1:
+        raise ValueError("Parameter interval must be a positive integer")
+
+    startDate = _date_parser(startDate, timeZone)
+    endDate = _date_parser(endDate, timeZone)
+
+    # every boundary is advanced from the start date, so clamping to the end of a month does not carry over to the later ranges.
+    dateRanges = []
+    firstDate = startDate
+    lastDate = _date_advancer(startDate, interval, unit)
+    # aware datetime objects of the same time zone compare by wall clock time, which repeats when clocks go back, hence the instants.
+    while lastDate.timestamp() <= endDate.timestamp():
+        dateRanges.append((int(firstDate.timestamp() * 1000), int(lastDate.timestamp() * 1000)))
+        firstDate = lastDate
+        lastDate = _date_advancer(startDate, interval * (len(dateRanges) + 1), unit)
+
+    return tuple(dateRanges)
+
+
+@functools.lru_cache(maxsize=256)
+def _client_date_advancer(datesTuple: tuple, interval: int = 1, unit: str = "month", timeZone: str = "UTC"):
+    """
+  Description:
+    Returns a tuple of time zone aware datetime.datetime objects, each one the respective date of datesTuple advanced by interval units.
+  Arguments:
+    datesTuple  (tuple) (mandatory): A tuple of ISO 8601 strings or datetime objects.
+    interval    (int)   (optional): self-explanatory. Defaults to 1.
+    unit        (str)   (optional): specified unit type to advance. Defaults to month.
+    timeZone    (str)   (optional): the time zone in which to interpret the dates. Defaults to UTC.
+  Notes:
+    -Results are memoized, hence repeated calls with the same arguments cost nothing.
+  """
+    return tuple(_date_advancer(_date_parser(date, timeZone), interval, unit) for date in datesTuple)
+
+
+def _joda_to_strftime(timeFormat: str):
+    """
+  Description:
+    Returns the strftime equivalent of a Joda-Time datetime pattern, or None if the pattern has letters missing from JODA_TO_STRFTIME.
+  Arguments:
+    timeFormat  (str)   (mandatory): A datetime pattern.
+  Notes:
+    -Quoted literals are not supported.
+  """
+    strftimeFormat = ""
+    # split the pattern into runs of the same letter and runs of non-letters.
+    for match in re.finditer(r"([A-Za-z])\1*|[^A-Za-z]+", timeFormat):
+        token = match.group(0)
+        if not token[0].isalpha():
+            strftimeFormat += token.replace("%", "%%")
+        elif token in JODA_TO_STRFTIME:
+            strftimeFormat += JODA_TO_STRFTIME[token]
+        else:
+            return None
+    return strftimeFormat
@@ -0,0 +1,178 @@
+import ee
+import os
+import json
+import time
+import shapely
+import shapely.geometry
+from . import date
+from . import cache
+from . import initialization
+from . import instrumentation
+
+"""
+Utilizing the static methods of Google Earth Engine's Python API and shapely this module includes functions to handle the process of
+selecting a small set of tiles of an image collection that cover an area of interest.
+"""
+
+# the orbit (or path) and tile (or row) properties of the supported image collections.
+SENSOR_PROPERTIES = {
+    "sentinel2": {"group": "SENSING_ORBIT_NUMBER", "tile": "MGRS_TILE"},
+    "landsat": {"group": "WRS_PATH", "tile": "WRS_ROW"}
+}
+
+FOOTPRINTS_PATH = os.path.join(os.path.expanduser("~"), ".cache", "geetils", "footprints")
+
+
+class _FootprintIndex:
+    """
+    Description:
+        A spatial index of the footprints of the images of a collection, queried on the client.
+    Arguments:
+        records (list)  (mandatory): A list of dictionaries with the keys "index" (system:index), "group", "tile", "time" (milliseconds)
+                                     and "footprint" (GeoJSON geometry), as retrieved by _footprint_index_creator.
+    Notes:
+        -Footprints are indexed with a shapely STRtree, and areas are measured in square degrees, which suffices to compare coverages.
+        -A tile is a (group, tile) pair, e.g. a Sentinel-2 MGRS tile as seen from one relative orbit.
+    """
+
+    def __init__(self, records: list):
+        self.records = records
+        self.footprints = [shapely.geometry.shape(record["footprint"]) for record in records]
+        self.tree = shapely.STRtree(self.footprints)
+
+    def query(self, aoi, startDate=None, endDate=None, timeZone: str = "UTC"):
+        """
+        Description:
+            Returns the sorted positions of the records whose footprint intersects the aoi and whose time lies in [startDate, endDate).
+        Arguments:
+            aoi         (shapely geometry/dict/ee.Geometry) (mandatory): The area of interest, in EPSG:4326.
+            startDate   (str/datetime)                      (optional): The inclusive start date. Defaults to None, which means no limit.
+            endDate     (str/datetime)                      (optional): The exclusive end date. Defaults to None, which means no limit.
+            timeZone    (str)                               (optional): The time zone in which to interpret the dates. Defaults to UTC.
+        Notes:
+            -An ee.Geometry aoi is retrieved with a getInfo, every other step runs on the client.
+        """
+        aoi = _aoi_creator(aoi)
+        startTime = date._date_parser(startDate, timeZone).timestamp() * 1000 if startDate is not None else float("-inf")
+        endTime = date._date_parser(endDate, timeZone).timestamp() * 1000 if endDate is not None else float("inf")
+
+        return [int(position) for position in sorted(self.tree.query(aoi, predicate="intersects"))
+                if startTime <= self.records[position]["time"] < endTime]
+
+    def minimal_cover(self, aoi, startDate=None, endDate=None, timeZone: str = "UTC", tolerance: float = 0.001):
+        """
+        Description:
+            Returns a tuple of the (group, tile) pairs picked to cover the aoi and the sorted positions of their records.
+        Arguments:
+            aoi         (shapely geometry/dict/ee.Geometry) (mandatory): The area of interest, in EPSG:4326.
+            startDate   (str/datetime)                      (optional): The inclusive start date. Defaults to None, which means no limit.
+            endDate     (str/datetime)                      (optional): The exclusive end date. Defaults to None, which means no limit.
+            timeZone    (str)                               (optional): The time zone in which to interpret the dates. Defaults to UTC.
+            tolerance   (float)                             (optional): The fraction of the aoi that may be left uncovered. Defaults to 0.001.
+        Notes:
+            -Tiles are picked greedily, the one covering the largest uncovered area first, until the uncovered area is at most tolerance
+            times the area of the aoi or no tile covers any more of it.
+            -The greedy pick is not guaranteed to be the fewest tiles, but it is within a logarithmic factor of it and in practice drops
+            the redundant tiles of overlapping orbits.
+        """
+        aoi = _aoi_creator(aoi)
+        if aoi.area == 0:
+            # points and lines are given an area of about a decimeter wide, so that the coverages of the tiles can be compared.
+            aoi = aoi.buffer(1e-6)
+
+        tilesDictionary = {}
+        for position in self.query(aoi, startDate, endDate, timeZone):
+            record = self.records[position]
+            tilesDictionary.setdefault((record["group"], record["tile"]), []).append(position)
+
+        # the part of the aoi each tile covers, over the whole date range.
+        coverages = {key: shapely.union_all([self.footprints[position] for position in positions]).intersection(aoi)
+                     for key, positions in tilesDictionary.items()}
+
+        selectedTiles = []
+        uncovered = aoi
+        while coverages and uncovered.area > tolerance * aoi.area:
+            key, coverage = max(coverages.items(), key=lambda item: item[1].intersection(uncovered).area)
+            if coverage.intersection(uncovered).area == 0:
+                break
+            selectedTiles.append(key)
+            uncovered = uncovered.difference(coverage)
+            del coverages[key]
+
+        return selectedTiles, sorted(position for key in selectedTiles for position in tilesDictionary[key])
+
+    def filtered_collection(self, collection, aoi, startDate=None, endDate=None, timeZone: str = "UTC", tolerance: float = 0.001):
+        """
+        Description:
+            Returns the collection filtered to the images of the tiles picked by minimal_cover.
+        Arguments:
+            collection  (ee.ImageCollection)                (mandatory): The collection the index was created from, or a subset of it.
+            aoi         (shapely geometry/dict/ee.Geometry) (mandatory): The area of interest, in EPSG:4326.
+            startDate   (str/datetime)                      (optional): The inclusive start date. Defaults to None, which means no limit.
+            endDate     (str/datetime)                      (optional): The exclusive end date. Defaults to None, which means no limit.
+            timeZone    (str)                               (optional): The time zone in which to interpret the dates. Defaults to UTC.
+            tolerance   (float)                             (optional): See minimal_cover. Defaults to 0.001.
+        Notes:
+            -The images are selected by system:index with a single ee.Filter.inList, so the filter size grows with the selected images only.
+        """
+        _, positions = self.minimal_cover(aoi, startDate, endDate, timeZone, tolerance)
+        return collection.filter(ee.Filter.inList("system:index", [self.records[position]["index"] for position in positions]))
+
+
+@initialization._ensure_initialized
+def _footprint_index_creator(collection, sensor: str = "sentinel2", path: str = None, refresh: bool = False):
+    """
+    Description:
+        Returns a _FootprintIndex of an image collection, retrieving its footprints from the server only once.
+    Arguments:
+        collection  (ee.ImageCollection)    (mandatory): Self-explanatory.
+        sensor      (str)                   (optional): A key of SENSOR_PROPERTIES. Defaults to "sentinel2".
+        path        (str)                   (optional): The directory of the local footprints cache. Defaults to FOOTPRINTS_PATH.
+        refresh     (bool)                  (optional): Whether to retrieve the footprints even if they are cached. Defaults to False.
+    Notes:
+        -The system:index, orbit (or path), tile (or row), acquisition time and footprint of all images are retrieved in a single getInfo
+        and kept in a JSON file keyed on the serialized expression, so any later index of the same collection needs no server interaction.
+        -The JSON file expires cache.CACHE_STATE["ttl"] seconds after it was written, as the disk cache of getInfo does, so that images
+        added to a collection without an end date are picked up.
+        -Example:
+            index = _footprint_index_creator(ee.ImageCollection("COPERNICUS/S2_SR").filterDate("2020-01-01", "2021-01-01"))
+            collection = index.filtered_collection(collection, aoi, "2020-03-01", "2020-06-01")
+    """
+    if sensor not in SENSOR_PROPERTIES:
+        raise ValueError("Parameter sensor must be one of {}".format(list(SENSOR_PROPERTIES.keys())))
+
+    properties = SENSOR_PROPERTIES[sensor]
+
+    def _inner_function(image):
+        footprint = image.geometry()
+        record = ee.List([image.get("system:index"), image.get(properties["group"]), image.get(properties["tile"]),
+                          image.get("system:time_start"), footprint.type(), footprint.coordinates()])
+        return image.set("geetils_footprint", record)
+
+    footprintsList = collection.map(_inner_function).aggregate_array("geetils_footprint")
+
+    if path is None:
+        path = FOOTPRINTS_PATH
+    filePath = os.path.join(path, "{}.json".format(cache._expression_key(footprintsList)))
+
+    # a file older than the time to live of the disk cache is retrieved again.
+    if refresh or not os.path.isfile(filePath) or os.path.getmtime(filePath) + cache.CACHE_STATE["ttl"] <= time.time():
+        records = [{"index": index, "group": group, "tile": tile, "time": time, "footprint": {"type": geometryType, "coordinates": coordinates}}
+                   for index, group, tile, time, geometryType, coordinates in instrumentation._get_info(footprintsList)]
+        os.makedirs(path, exist_ok=True)
+        with open(filePath, "w") as file:
+            json.dump(records, file)
+    else:
+        with open(filePath) as file:
+            records = json.load(file)
+
+    return _FootprintIndex(records)
+
+
+def _aoi_creator(aoi):
+    # a shapely geometry from a shapely geometry, a GeoJSON dictionary or an ee.Geometry (retrieved with a getInfo).
+    if isinstance(aoi, ee.ComputedObject):
+        aoi = instrumentation._get_info(aoi)
+    if isinstance(aoi, dict):
+        aoi = shapely.geometry.shape(aoi)
+    return aoi
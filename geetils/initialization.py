@@ -0,0 +1,100 @@
+import ee
+import os
+import functools
+import threading
+
+"""
+Utilizing the static methods of Google Earth Engine's Python API this module includes functions to handle the process of initializing
+Earth Engine lazily, once per process.
+"""
+
+INITIALIZATION_LOCK = threading.Lock()
+
+# the keyword arguments passed to ee.Initialize and the id of the process in which it was last called.
+INITIALIZATION_STATE = {
+    "kwargs": {},
+    "processId": None
+}
+
+
+def _reset_after_fork():
+    # a forked process inherits the state of its parent but not its connections, so it initializes again on first use.
+    global INITIALIZATION_LOCK
+    INITIALIZATION_LOCK = threading.Lock()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_after_fork)
+
+
+def _configure(**kwargs):
+    """
+    Description:
+        Sets the keyword arguments with which Earth Engine will be initialized, without initializing it.
+    Arguments:
+        kwargs  (dict)  (optional): Keyword arguments of ee.Initialize (e.g. credentials, project, opt_url).
+    Notes:
+        -Has no effect on a process that has already been initialized.
+    """
+    INITIALIZATION_STATE["kwargs"] = dict(kwargs)
+
+
+def _initialize(**kwargs):
+    """
+    Description:
+        Initializes Earth Engine, unless it has already been initialized in the current process.
+    Arguments:
+        kwargs  (dict)  (optional): Keyword arguments of ee.Initialize. Defaults to the ones set with _configure.
+    Notes:
+        -Every function of geetils that talks to the server calls it first, hence there is no need to call it explicitly.
+        -It is safe to call from multiple threads, only one of them initializes Earth Engine.
+        -A process already initialized by the caller (e.g. with ee.Initialize(project="my-project")) is left as is, unless keyword
+        arguments are provided. A process forked from an initialized one is initialized again only if arguments were set with _configure,
+        as those of the parent are not known otherwise.
+    """
+    processId = os.getpid()
+    if INITIALIZATION_STATE["processId"] == processId:
+        return
+
+    with INITIALIZATION_LOCK:
+        if INITIALIZATION_STATE["processId"] == processId:
+            return
+
+        # a recorded id of another process means that the state was inherited from a forked parent.
+        forked = INITIALIZATION_STATE["processId"] is not None
+        if kwargs or not ee.data.is_initialized() or (forked and INITIALIZATION_STATE["kwargs"]):
+            ee.Initialize(**(kwargs or INITIALIZATION_STATE["kwargs"]))
+        INITIALIZATION_STATE["processId"] = processId
+
+
+def _worker_initializer(kwargs: dict = None):
+    """
+    Description:
+        Initializes Earth Engine in a worker process of a process pool.
+    Arguments:
+        kwargs  (dict)  (optional): Keyword arguments of ee.Initialize. Defaults to None.
+    Notes:
+        -Meant to be the initializer of a pool, e.g. concurrent.futures.ProcessPoolExecutor(initializer=_worker_initializer,
+        initargs=({"project": "my-project"},)).
+        -Workers which are not initialized this way initialize on their first call to geetils instead.
+    """
+    if kwargs:
+        _configure(**kwargs)
+    _initialize()
+
+
+def _ensure_initialized(function):
+    """
+    Description:
+        Decorates a function so that Earth Engine is initialized before the function is called.
+    Arguments:
+        function    (callable)  (mandatory): Self-explanatory.
+    Notes:
+        None.
+    """
+    @functools.wraps(function)
+    def _inner_function(*args, **kwargs):
+        _initialize()
+        return function(*args, **kwargs)
+
+    return _inner_function
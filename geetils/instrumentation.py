@@ -0,0 +1,308 @@
+import ee
+import sys
+import json
+import time
+import atexit
+import bisect
+import tabulate
+import threading
+import contextlib
+from . import cache
+
+"""
+Utilizing the static methods of Google Earth Engine's Python API this module includes functions to handle the process of measuring the
+blocking server interactions of geetils.
+"""
+
+INSTRUMENTATION_LOCK = threading.Lock()
+
+# statistics maps each calling function to a dictionary from server call name to {"count", "seconds", "bytes", "latencies"}.
+INSTRUMENTATION_STATE = {
+    "enabled": False,
+    "histogramAtExit": False,
+    "callbacks": [],
+    "statistics": {}
+}
+
+# upper bounds, in seconds, of the latency histogram buckets.
+LATENCY_BUCKETS = [0.01, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60]
+
+
+def _enable(histogramAtExit: bool = False):
+    """
+    Description:
+        Starts recording the server interactions of geetils.
+    Arguments:
+        histogramAtExit (bool)  (optional): Whether to print the latency histogram when the interpreter exits. Defaults to False.
+    Notes:
+        -Recording is off by default, in which case the server interactions are performed without any bookkeeping.
+    """
+    INSTRUMENTATION_STATE["enabled"] = True
+
+    if histogramAtExit and not INSTRUMENTATION_STATE["histogramAtExit"]:
+        INSTRUMENTATION_STATE["histogramAtExit"] = True
+        atexit.register(lambda: print(_latency_histogram()))
+
+
+def _disable():
+    """
+    Description:
+        Stops recording the server interactions of geetils, keeping the statistics recorded so far.
+    Arguments:
+        None.
+    Notes:
+        None.
+    """
+    INSTRUMENTATION_STATE["enabled"] = False
+
+
+def _reset():
+    """
+    Description:
+        Discards the statistics recorded so far.
+    Arguments:
+        None.
+    Notes:
+        None.
+    """
+    with INSTRUMENTATION_LOCK:
+        INSTRUMENTATION_STATE["statistics"] = {}
+
+
+def _add_callback(callback):
+    """
+    Description:
+        Registers a function to be called after each recorded server interaction.
+    Arguments:
+        callback    (callable)  (mandatory): A function accepting a dictionary with the keys "caller", "call", "seconds" and "bytes".
+    Notes:
+        -Callbacks are called from the thread that performed the server interaction.
+    """
+    INSTRUMENTATION_STATE["callbacks"].append(callback)
+
+
+def _remove_callback(callback):
+    """
+    Description:
+        Unregisters a function registered with _add_callback.
+    Arguments:
+        callback    (callable)  (mandatory): Self-explanatory.
+    Notes:
+        None.
+    """
+    INSTRUMENTATION_STATE["callbacks"].remove(callback)
+
+
+def _statistics():
+    """
+    Description:
+        Returns a copy of the recorded statistics, as a dictionary from calling function to server call name to a dictionary with the
+        keys "count", "seconds" (total), "bytes" (total, received) and "latencies" (list, in seconds).
+    Arguments:
+        None.
+    Notes:
+        -Calling functions are named "module.function", e.g. "geetils.common._sentinel2_coverage".
+    """
+    with INSTRUMENTATION_LOCK:
+        return {caller: {callName: dict(record, latencies=list(record["latencies"])) for callName, record in callsDictionary.items()}
+                for caller, callsDictionary in INSTRUMENTATION_STATE["statistics"].items()}
+
+
+@contextlib.contextmanager
+def _profiling():
+    """
+    Description:
+        Records the server interactions of geetils performed within the with block and yields a dictionary that is filled, on exit,
+        with the statistics of that block alone.
+    Arguments:
+        None.
+    Notes:
+        -Example:
+            with instrumentation._profiling() as statistics:
+                common._sentinel2_coverage(collection)
+            print(statistics)
+    """
+    blockStatistics = {}
+    blockRecords = []
+    wasEnabled = INSTRUMENTATION_STATE["enabled"]
+
+    _add_callback(blockRecords.append)
+    _enable()
+    try:
+        yield blockStatistics
+    finally:
+        _remove_callback(blockRecords.append)
+        if not wasEnabled:
+            _disable()
+        for record in blockRecords:
+            _statistics_update(blockStatistics, record)
+
+
+def _latency_histogram(statistics: dict = None):
+    """
+    Description:
+        Returns a table with the number of server interactions per call name and latency bucket.
+    Arguments:
+        statistics  (dict)  (optional): Statistics as returned by _statistics or _profiling. Defaults to the recorded statistics.
+    Notes:
+        -Each column counts the interactions that took at most the seconds in its header and more than those of the previous column.
+    """
+    if statistics is None:
+        statistics = _statistics()
+
+    histogram = {}
+    for callsDictionary in statistics.values():
+        for callName, record in callsDictionary.items():
+            counts = histogram.setdefault(callName, [0] * (len(LATENCY_BUCKETS) + 1))
+            for latency in record["latencies"]:
+                counts[bisect.bisect_left(LATENCY_BUCKETS, latency)] += 1
+
+    headers = ["Call"] + ["<={}s".format(bound) for bound in LATENCY_BUCKETS] + [">{}s".format(LATENCY_BUCKETS[-1])]
+    return tabulate.tabulate([[callName] + counts for callName, counts in sorted(histogram.items())], headers=headers)
+
+
+def _statistics_update(statistics: dict, record: dict):
+    callsDictionary = statistics.setdefault(record["caller"], {})
+    callRecord = callsDictionary.setdefault(record["call"], {"count": 0, "seconds": 0.0, "bytes": 0, "latencies": []})
+    callRecord["count"] += 1
+    callRecord["seconds"] += record["seconds"]
+    callRecord["bytes"] += record["bytes"]
+    callRecord["latencies"].append(record["seconds"])
+
+
+def _caller():
+    # the innermost geetils function on the stack, outside of this module and of the initialization helpers.
+    frame = sys._getframe(1)
+    while frame is not None:
+        moduleName = frame.f_globals.get("__name__", "")
+        if moduleName.startswith("geetils") and moduleName not in ["geetils.instrumentation", "geetils.initialization"]:
+            return "{}.{}".format(moduleName, getattr(frame.f_code, "co_qualname", frame.f_code.co_name))
+        frame = frame.f_back
+    return None
+
+
+@contextlib.contextmanager
+def _server_call(callName: str):
+    """
+    Description:
+        Records the server interaction performed within the with block. Yields a dictionary whose "bytes" key may be set by the block.
+    Arguments:
+        callName    (str)   (mandatory): The name under which the interaction is recorded.
+    Notes:
+        -Interactions that raise are recorded as well.
+    """
+    record = {"caller": None, "call": callName, "seconds": 0.0, "bytes": 0}
+    if not INSTRUMENTATION_STATE["enabled"]:
+        yield record
+        return
+
+    record["caller"] = _caller()
+    startTime = time.perf_counter()
+    try:
+        yield record
+    finally:
+        record["seconds"] = time.perf_counter() - startTime
+        with INSTRUMENTATION_LOCK:
+            _statistics_update(INSTRUMENTATION_STATE["statistics"], record)
+        for callback in list(INSTRUMENTATION_STATE["callbacks"]):
+            callback(record)
+
+
+def _response_size(response):
+    return len(json.dumps(response, default=str)) if INSTRUMENTATION_STATE["enabled"] else 0
+
+
+def _get_info(computedObject):
+    """
+    Description:
+        Returns the result of computedObject.getInfo(), recording the interaction.
+    Arguments:
+        computedObject  (ee.ComputedObject) (mandatory): Self-explanatory.
+    Notes:
+        -The recorded bytes are the size of the result serialized as JSON.
+        -When the disk cache is enabled (see cache._enable), a result found in it is returned without a server interaction, hence is not
+        recorded.
+    """
+    key = cache._expression_key(computedObject) if cache.CACHE_STATE["enabled"] else None
+    if key is not None:
+        found, result = cache._lookup(key)
+        if found:
+            return result
+
+    with _server_call("getInfo") as record:
+        result = computedObject.getInfo()
+        record["bytes"] = _response_size(result)
+
+    if key is not None:
+        cache._store(key, result)
+    return result
+
+
+def _get_download_url(image, params: dict):
+    """
+    Description:
+        Returns the result of image.getDownloadURL(params), recording the interaction.
+    Arguments:
+        image   (ee.Image)  (mandatory): Self-explanatory.
+        params  (dict)      (mandatory): Self-explanatory.
+    Notes:
+        None.
+    """
+    with _server_call("getDownloadURL"):
+        return image.getDownloadURL(params)
+
+
+def _start_task(task):
+    """
+    Description:
+        Starts an export task, recording the interaction.
+    Arguments:
+        task    (ee.batch.Task) (mandatory): Self-explanatory.
+    Notes:
+        None.
+    """
+    with _server_call("Task.start"):
+        task.start()
+
+
+def _cancel_task(task):
+    """
+    Description:
+        Cancels an export task, recording the interaction.
+    Arguments:
+        task    (ee.batch.Task) (mandatory): Self-explanatory.
+    Notes:
+        None.
+    """
+    with _server_call("Task.cancel"):
+        task.cancel()
+
+
+def _get_task_status(exportTasksIdsList: list):
+    """
+    Description:
+        Returns the result of ee.data.getTaskStatus(exportTasksIdsList), recording the interaction.
+    Arguments:
+        exportTasksIdsList  (list)  (mandatory): Self-explanatory.
+    Notes:
+        None.
+    """
+    with _server_call("getTaskStatus") as record:
+        result = ee.data.getTaskStatus(exportTasksIdsList)
+        record["bytes"] = _response_size(result)
+    return result
+
+
+def _get_task_list():
+    """
+    Description:
+        Returns the result of ee.data.getTaskList(), recording the interaction.
+    Arguments:
+        None.
+    Notes:
+        None.
+    """
+    with _server_call("getTaskList") as record:
+        result = ee.data.getTaskList()
+        record["bytes"] = _response_size(result)
+    return result
@@ -0,0 +1,178 @@
+import os
+import json
+import zipfile
+import numpy as np
+from . import masking
+
+"""
+Utilizing NumPy and rasterio this module includes functions to handle the process of ingesting and masking downloaded rasters locally,
+consistently with the masks created on the server.
+"""
+
+# the number of pixels decoded at once.
+CHUNK_SIZE = 1024 * 1024
+
+
+def _local_mask_band_creation(qaArray, specification, chunkSize: int = CHUNK_SIZE):
+    """
+    Description:
+        Returns a boolean array of the shape of qaArray, True where none of the options of the compiled specification holds.
+    Arguments:
+        qaArray         (np.ndarray)                    (mandatory): The bitmask band, of an integer type.
+        specification   (masking.MaskSpecification)     (mandatory): self-explanatory.
+        chunkSize       (int)                           (optional): The number of pixels decoded at once. Defaults to CHUNK_SIZE.
+    Notes:
+        -Equals the mask created on the server by masking._compiled_mask_band_creation, with True for 1.
+        -The temporary arrays are at most chunkSize pixels, so memory stays bounded on large tiles.
+    """
+    qaArray = np.asarray(qaArray)
+    if not np.issubdtype(qaArray.dtype, np.integer):
+        raise ValueError("The QA band must be of an integer type, not {}.".format(qaArray.dtype))
+
+    mask = np.empty(qaArray.shape, dtype=bool)
+    flatQaArray = qaArray.reshape(-1)
+    flatMask = mask.reshape(-1)
+
+    for start in range(0, flatQaArray.size, chunkSize):
+        chunk = flatQaArray[start:start + chunkSize]
+        chunkMask = flatMask[start:start + chunkSize]
+
+        if specification.flags:
+            np.equal(chunk & specification.flags, 0, out=chunkMask)
+        else:
+            chunkMask[:] = True
+        for firstBit, widthMask, operand in specification.fields:
+            chunkMask &= ((chunk >> firstBit) & widthMask) != operand
+
+    return mask
+
+
+def _local_cloud_mask(qaArray, bitsName: str, providedOptions: list = None, chunkSize: int = CHUNK_SIZE):
+    """
+    Description:
+        Returns a boolean cloud mask of a downloaded QA band, True for the pixels to keep.
+    Arguments:
+        qaArray         (np.ndarray)    (mandatory): The bitmask band, of an integer type.
+        bitsName        (str)           (mandatory): A key of masking.MASK_REGISTRY (e.g. "BITS_LANDSAT_BQA_L8").
+        providedOptions (list)          (optional): self-explanatory. Defaults to the "defaultOptions" of the bitmask.
+        chunkSize       (int)           (optional): The number of pixels decoded at once. Defaults to CHUNK_SIZE.
+    Notes:
+        -Uses the same BITS_* definitions and compiled specifications as the masking module, hence needs no server interaction.
+        -Example: _local_cloud_mask(dataset.read(dataset.descriptions.index("BQA") + 1), "BITS_LANDSAT_BQA_L8", ["cloud"]).
+    """
+    if providedOptions is None:
+        providedOptions = masking.MASK_REGISTRY.get(bitsName, {}).get("defaultOptions", ())
+
+    specification = masking._mask_specification(bitsName, tuple(sorted(set(providedOptions))))
+    return _local_mask_band_creation(qaArray, specification, chunkSize)
+
+
+def _local_cloud_mask_application(array, mask, nonValue=None):
+    """
+    Description:
+        Applies a local cloud mask on an array.
+    Arguments:
+        array       (np.ndarray)    (mandatory): The array on which the cloud mask will be applied, of shape (..., rows, columns).
+        mask        (np.ndarray)    (mandatory): The boolean cloud mask, of shape (rows, columns).
+        nonValue    (int/float)     (optional): The value which will be applied at all positions where the mask is False. Defaults to None.
+    Notes:
+        -Returns a np.ma.MaskedArray if nonValue is None, otherwise a filled np.ndarray.
+    """
+    maskedArray = np.ma.masked_array(array, mask=np.broadcast_to(~mask, np.shape(array)))
+
+    if nonValue is not None:
+        return maskedArray.filled(nonValue)
+
+    return maskedArray
+
+
+def _zip_to_memory_map(zipPath: str, arrayPath: str = None, bandNames: list = None):
+    """
+    Description:
+        Writes the bands of a downloaded zip of GeoTIFFs into a single memory-mapped .npy array, of shape (bands, rows, columns), and its
+        georeferencing into a JSON sidecar. Returns the path of the array.
+    Arguments:
+        zipPath     (str)   (mandatory): The path of the zip, as downloaded by _image_to_local_hard_drive_exporter.
+        arrayPath   (str)   (optional): The path of the array. Defaults to zipPath with the extension .npy.
+        bandNames   (list)  (optional): The band names in the order of the array. Defaults to the order of the zip.
+    Notes:
+        -The GeoTIFFs are read from within the zip block by block, so no file is extracted and memory stays bounded by a block.
+        -Band names are taken from the file names ("<description>.<band>.tif") of single-band files, as with filePerBand, and from the
+        band descriptions of multi-band files.
+        -The sidecar is arrayPath with the extension .json and holds the keys "bands", "shape", "dtype", "crs" (WKT), "transform" (the
+        six affine coefficients) and "nodata".
+        -Raises a ValueError if the bands do not share the same grid.
+    """
+    # rasterio is only imported to ingest, so that the mask decoding of this module needs NumPy alone.
+    import rasterio
+
+    if arrayPath is None:
+        arrayPath = "{}.npy".format(os.path.splitext(zipPath)[0])
+
+    with zipfile.ZipFile(zipPath) as file:
+        memberNames = [name for name in file.namelist() if name.lower().endswith((".tif", ".tiff"))]
+
+    # (member name, band index within the member) of each band name, in the order of the zip.
+    bandSources = {}
+    profile = None
+    dtypes = []
+    for memberName in memberNames:
+        with rasterio.open("zip://{}!{}".format(os.path.abspath(zipPath), memberName)) as dataset:
+            if profile is None:
+                profile = {"shape": (dataset.height, dataset.width), "crs": dataset.crs, "transform": dataset.transform, "nodata": dataset.nodata}
+            elif (dataset.height, dataset.width) != profile["shape"] or dataset.transform != profile["transform"]:
+                raise ValueError("The bands of {} do not share the same grid.".format(zipPath))
+
+            dtypes.extend(dataset.dtypes)
+            stem = os.path.splitext(os.path.basename(memberName))[0]
+            for bandIndex in dataset.indexes:
+                if dataset.count == 1:
+                    bandName = stem.split(".")[-1]
+                else:
+                    bandName = dataset.descriptions[bandIndex - 1] or "{}_{}".format(stem, bandIndex)
+                bandSources[bandName] = (memberName, bandIndex)
+
+    if profile is None:
+        raise ValueError("{} holds no GeoTIFF.".format(zipPath))
+
+    if bandNames is None:
+        bandNames = list(bandSources.keys())
+    elif not all(bandName in bandSources for bandName in bandNames):
+        raise ValueError("One or more of the band names are not in {}. Available bands are: {}".format(zipPath, list(bandSources.keys())))
+
+    shape = (len(bandNames),) + profile["shape"]
+    dtype = np.result_type(*dtypes)
+    array = np.lib.format.open_memmap(arrayPath, mode="w+", dtype=dtype, shape=shape)
+
+    for position, bandName in enumerate(bandNames):
+        memberName, bandIndex = bandSources[bandName]
+        with rasterio.open("zip://{}!{}".format(os.path.abspath(zipPath), memberName)) as dataset:
+            for _, window in dataset.block_windows(bandIndex):
+                rows, columns = window.toslices()
+                array[position, rows, columns] = dataset.read(bandIndex, window=window)
+
+    array.flush()
+    del array
+
+    metadata = {"bands": bandNames, "shape": list(shape), "dtype": str(dtype), "crs": profile["crs"].to_wkt() if profile["crs"] else None,
+                "transform": list(profile["transform"])[:6], "nodata": profile["nodata"]}
+    with open("{}.json".format(os.path.splitext(arrayPath)[0]), "w") as file:
+        json.dump(metadata, file, indent=2)
+
+    return arrayPath
+
+
+def _memory_map_loader(arrayPath: str, mode: str = "r"):
+    """
+    Description:
+        Returns a tuple of the memory-mapped array written by _zip_to_memory_map and the dictionary of its sidecar.
+    Arguments:
+        arrayPath   (str)   (mandatory): Self-explanatory.
+        mode        (str)   (optional): The memory-map mode of np.load (e.g. "r", "r+" or "c"). Defaults to "r".
+    Notes:
+        -Opening is near instant, as the pixels are only read from disk when accessed.
+    """
+    with open("{}.json".format(os.path.splitext(arrayPath)[0])) as file:
+        metadata = json.load(file)
+
+    return np.load(arrayPath, mmap_mode=mode), metadata
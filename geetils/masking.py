@@ -1,5 +1,9 @@
 import ee
 import textwrap
+import functools
+import collections
+from . import initialization
+from . import instrumentation
 
 """
 Utilizing the static methods of Google Earth Engine's Python API this module includes 
@@ -96,17 +100,41 @@ BITS_LANDSAT_PIXEL_QA_L8 = {
     'occlusion': {'10': 1}
 }
 
-# Cloud mask naming convention.
-NAMING_CONVENTION = {
-    "BITS_SENTINEL2_BQA": "QA60",
-    "BITS_SENTINEL2_SLC": "SLC",
-    "BITS_LANDSAT_BQA": "BQA",
-    "BITS_LANDSAT_CLOUD_QA": "CLOUD_QA",
-    "BITS_LANDSAT_PIXEL_QA": "PIXEL_QA",
-    "BITS_LANDSAT_BQA_L8": "BQA",
-    "BITS_LANDSAT_PIXEL_QA_L8": "PIXEL_QA"
+# bitmask definitions, the bands of the images they apply to and the options used when none are provided.
+MASK_REGISTRY = {
+    "BITS_SENTINEL2_BQA": {"bits": BITS_SENTINEL2_BQA, "band": "QA60", "defaultOptions": ("cloud", "cirrus")},
+    "BITS_SENTINEL2_SCL": {"bits": BITS_SENTINEL2_SCL, "band": "SCL", "defaultOptions": ("high_clouds_probability", "cirrus", "cloud_shadows")},
+    "BITS_LANDSAT_BQA": {"bits": BITS_LANDSAT_BQA, "band": "BQA", "defaultOptions": ("high_cloud_confidence", "high_cloud_shadow_confidence")},
+    "BITS_LANDSAT_CLOUD_QA": {"bits": BITS_LANDSAT_CLOUD_QA, "band": "sr_cloud_qa", "defaultOptions": ("cloud", "shadow")},
+    "BITS_LANDSAT_PIXEL_QA": {"bits": BITS_LANDSAT_PIXEL_QA, "band": "pixel_qa", "defaultOptions": ("cloud", "high_cloud_confidence", "shadow")},
+    "BITS_LANDSAT_BQA_L8": {"bits": BITS_LANDSAT_BQA_L8, "band": "BQA",
+                            "defaultOptions": ("high_cloud_confidence", "high_cirrus_confidence", "high_cloud_shadow_confidence")},
+    "BITS_LANDSAT_PIXEL_QA_L8": {"bits": BITS_LANDSAT_PIXEL_QA_L8, "band": "pixel_qa",
+                                 "defaultOptions": ("high_cloud_confidence", "high_cirrus_confidence")}
 }
 
+# Cloud mask naming convention: the bitmask band of each registered bitmask.
+NAMING_CONVENTION = {bitsName: registration["band"] for bitsName, registration in MASK_REGISTRY.items()}
+
+# QA bands, in the order they are looked for, and their bitmask per SPACECRAFT_ID ("default" for any other spacecraft).
+SENSOR_DETECTION = {
+    "QA60": {"default": "BITS_SENTINEL2_BQA"},
+    "SCL": {"default": "BITS_SENTINEL2_SCL"},
+    "pixel_qa": {"LANDSAT_8": "BITS_LANDSAT_PIXEL_QA_L8", "default": "BITS_LANDSAT_PIXEL_QA"},
+    "BQA": {"LANDSAT_8": "BITS_LANDSAT_BQA_L8", "default": "BITS_LANDSAT_BQA"}
+}
+
+# collection id prefixes and the SPACECRAFT_ID of their images.
+SPACECRAFT_DETECTION = {
+    "LANDSAT/LC08": "LANDSAT_8",
+    "LANDSAT/LE07": "LANDSAT_7",
+    "LANDSAT/LT05": "LANDSAT_5",
+    "LANDSAT/LT04": "LANDSAT_4"
+}
+
+# a compiled mask: the bitmask band, the or-combined single-bit flags and the multi-bit fields as (first bit, width mask, value) tuples.
+MaskSpecification = collections.namedtuple("MaskSpecification", ["bandName", "flags", "fields"])
+
 
 def _help():
     """
@@ -120,20 +148,9 @@ def _help():
     prefix = "\t"
     preferredWidth = 70
     wrapper = textwrap.TextWrapper(initial_indent=prefix, width=preferredWidth, subsequent_indent=2 * prefix)
-    print(wrapper.fill("BITS_SENTINEL2_BQA"))
-    print(wrapper.fill(str(BITS_SENTINEL2_BQA.keys())))
-    print(wrapper.fill("BITS_SENTINEL2_SLC"))
-    print(wrapper.fill(str(BITS_SENTINEL2_SLC.keys())))
-    print(wrapper.fill("BITS_LANDSAT_BQA"))
-    print(wrapper.fill(str(BITS_LANDSAT_BQA.keys())))
-    print(wrapper.fill("BITS_LANDSAT_CLOUD_QA"))
-    print(wrapper.fill(str(BITS_LANDSAT_CLOUD_QA.keys())))
-    print(wrapper.fill("BITS_LANDSAT_PIXEL_QA"))
-    print(wrapper.fill(str(BITS_LANDSAT_PIXEL_QA.keys())))
-    print(wrapper.fill("BITS_LANDSAT_BQA_L8"))
-    print(wrapper.fill(str(BITS_LANDSAT_BQA_L8.keys())))
-    print(wrapper.fill("BITS_LANDSAT_PIXEL_QA_L8"))
-    print(wrapper.fill(str(BITS_LANDSAT_PIXEL_QA_L8.keys())))
+    for bitsName, registration in MASK_REGISTRY.items():
+        print(wrapper.fill(bitsName))
+        print(wrapper.fill(str(registration["bits"].keys())))
 
 
 def _cloud_mask_band_naming_convention(providedOptions):
@@ -150,35 +167,95 @@ def _cloud_mask_band_naming_convention(providedOptions):
     return "geetils_mask"
 
 
-def _generic_cloud_mask_band_creation(initialMaskBand, genericMaskName, operandsList, numberOfBitsList):
+def _mask_compiler(operandsList: list, numberOfBitsList: list, lastBitsList: list):
     """
     Description:
-        Creates a custom cloud mask from the provided initial bitmask band and options.
+        Returns a tuple of the or-combined single-bit flags and a tuple of the multi-bit fields as (first bit, width mask, value) tuples.
     Arguments:
-        initialMaskBand     (ee.Image)      (mandatory): The bit-mask image band.
-        genericMaskName     (str)           (mandatory): self-explanatory.
-        operandsList        (ee.List)       (mandatory): list of int values corresponding to provided options.
-        numberOfBitsList    (ee.List)       (mandatory): list of number to shift the operands.
+        operandsList        (list)  (mandatory): list of int values corresponding to provided options.
+        numberOfBitsList    (list)  (mandatory): list of the first bit of each option.
+        lastBitsList        (list)  (mandatory): list of the last bit of each option.
     Notes:
-        None.
+        -Raises a ValueError if a bit range is reversed or a value does not fit in its bit range.
     """
+    flags = 0
+    fields = []
+    for operand, firstBit, lastBit in zip(operandsList, numberOfBitsList, lastBitsList):
+        widthMask = (1 << (lastBit - firstBit + 1)) - 1 if lastBit >= firstBit else 0
+        if not 0 <= firstBit <= lastBit or not 0 <= operand <= widthMask:
+            raise ValueError("Value {} does not fit in bits {}-{}.".format(operand, firstBit, lastBit))
+
+        if firstBit == lastBit and operand == 1:
+            flags |= 1 << firstBit
+        else:
+            fields.append((firstBit, widthMask, operand))
+
+    return flags, tuple(fields)
 
-    def _left_shift(index):
-        return ee.Number(operandsList.get(index)).leftShift(numberOfBitsList.get(index))
 
-    def _inner_function(current, previous):
-        previous = ee.Image(previous)
-        temp = ee.Image(previous.bitwiseAnd(initialMaskBand.bitwiseAnd(ee.Number(current)).eq(0)))
-        return temp
+@functools.lru_cache(maxsize=None)
+def _mask_specification(bitsName: str, providedOptions: tuple):
+    """
+    Description:
+        Returns the MaskSpecification of the provided options of a registered bitmask, compiling it on first use.
+    Arguments:
+        bitsName        (str)   (mandatory): A key of MASK_REGISTRY (e.g. "BITS_LANDSAT_BQA_L8").
+        providedOptions (tuple) (mandatory): A sorted tuple of distinct options of the bitmask.
+    Notes:
+        -Specifications are cached, so masking every image of a collection compiles the options once.
+        -Raises a ValueError if the bitmask is not registered or any of the options is not available.
+    """
+    if bitsName not in MASK_REGISTRY:
+        raise ValueError("Bitmask {} is not registered. Registered bitmasks are: {}".format(bitsName, list(MASK_REGISTRY.keys())))
+
+    bits = MASK_REGISTRY[bitsName]["bits"]
 
-    #
-    sequence = ee.List.sequence(0, operandsList.size().subtract(1))
+    # check that all of the providedOptions values are available.
+    availableOptions = bits.keys()
+    if not all(option in availableOptions for option in providedOptions):
+        raise ValueError("One or more of the provided options are not available. Available options are: {}".format(availableOptions))
 
-    # bitwise left shift.
-    shiftedOptions = sequence.map(_left_shift)
+    operandsList = []
+    numberOfBitsList = []
+    lastBitsList = []
+    for option in providedOptions:
+        for innerKey, innerValue in bits[option].items():
+            if "-" in innerKey:
+                numberOfBits, lastBit = innerKey.split("-")
+            else:
+                numberOfBits = lastBit = innerKey
+
+            operandsList.append(innerValue)
+            numberOfBitsList.append(int(numberOfBits))
+            lastBitsList.append(int(lastBit))
+
+    flags, fields = _mask_compiler(operandsList, numberOfBitsList, lastBitsList)
+    return MaskSpecification(MASK_REGISTRY[bitsName]["band"], flags, fields)
+
+
+def _compiled_mask_band_creation(initialMaskBand, genericMaskName, specification):
+    """
+    Description:
+        Creates a cloud mask from the provided initial bitmask band and compiled specification.
+    Arguments:
+        initialMaskBand     (ee.Image)              (mandatory): The bit-mask image band.
+        genericMaskName     (str)                   (mandatory): self-explanatory.
+        specification       (MaskSpecification)     (mandatory): self-explanatory.
+    Notes:
+        -The mask is 0 wherever any of the options holds and 1 elsewhere.
+        -The mask is a single expression: the single-bit options are tested with one bitwiseAnd, and each multi-bit option (e.g. bits
+        5-6 equal to 3) is extracted with a rightShift and a bitwiseAnd and compared to its value.
+    """
+    masksList = []
+    if specification.flags:
+        masksList.append(initialMaskBand.bitwiseAnd(specification.flags).eq(0))
+    for firstBit, widthMask, operand in specification.fields:
+        masksList.append(initialMaskBand.rightShift(firstBit).bitwiseAnd(widthMask).neq(operand))
 
     # mask creation.
-    mask = ee.Image(shiftedOptions.iterate(_inner_function, ee.Image.constant(1)))
+    mask = masksList[0] if masksList else ee.Image.constant(1)
+    for fieldMask in masksList[1:]:
+        mask = mask.And(fieldMask)
 
     # rename newly created mask.
     mask = mask.rename(genericMaskName)
@@ -186,6 +263,54 @@ def _generic_cloud_mask_band_creation(initialMaskBand, genericMaskName, operands
     return mask
 
 
+@initialization._ensure_initialized
+def _generic_cloud_mask_band_creation(initialMaskBand, genericMaskName, operandsList: list, numberOfBitsList: list, lastBitsList: list = None):
+    """
+    Description:
+        Creates a custom cloud mask from the provided initial bitmask band and options.
+    Arguments:
+        initialMaskBand     (ee.Image)      (mandatory): The bit-mask image band.
+        genericMaskName     (str)           (mandatory): self-explanatory.
+        operandsList        (list)          (mandatory): list of int values corresponding to provided options.
+        numberOfBitsList    (list)          (mandatory): list of the first bit of each option.
+        lastBitsList        (list)          (optional): list of the last bit of each option. Defaults to numberOfBitsList (single bits).
+    Notes:
+        -The options are compiled on the client (see _mask_compiler and _compiled_mask_band_creation).
+    """
+    if lastBitsList is None:
+        lastBitsList = numberOfBitsList
+
+    flags, fields = _mask_compiler(operandsList, numberOfBitsList, lastBitsList)
+    return _compiled_mask_band_creation(initialMaskBand, genericMaskName, MaskSpecification(None, flags, fields))
+
+
+@initialization._ensure_initialized
+def _registered_cloud_mask_band_creation(image, bitsName: str, maskName: str = None, providedOptions: list = None):
+    """
+    Description:
+        Creates a cloud mask of an image from a registered bitmask and the provided options.
+    Arguments:
+        image           (ee.Image)  (mandatory): The image on which the cloud mask will be applied.
+        bitsName        (str)       (mandatory): A key of MASK_REGISTRY (e.g. "BITS_LANDSAT_BQA_L8").
+        maskName        (str)       (optional): The name of the soon to be created mask. Defaults to None.
+        providedOptions (list)      (optional): self-explanatory. Defaults to the "defaultOptions" of the bitmask in MASK_REGISTRY.
+    Notes:
+        -Duplicate options are ignored.
+    """
+    if providedOptions is None:
+        providedOptions = MASK_REGISTRY.get(bitsName, {}).get("defaultOptions", ())
+
+    # remove possible duplicate values from providedOptions, the sorted tuple is the key of the compiled specification.
+    specification = _mask_specification(bitsName, tuple(sorted(set(providedOptions))))
+
+    # check if no mask name was specified.
+    if maskName is None:
+        maskName = _cloud_mask_band_naming_convention(providedOptions)
+
+    return _compiled_mask_band_creation(image.select(specification.bandName), maskName, specification)
+
+
+@initialization._ensure_initialized
 def _cloud_mask_application(mask, image, nonValue: int = None):
     """
     Description:
@@ -205,317 +330,202 @@ def _cloud_mask_application(mask, image, nonValue: int = None):
     return image
 
 
-def _sentinel2_qa(image, maskName: str = None, providedOptions: list = ('cloud', 'cirrus')):
+def _sensor_detector(collectionId: str, bandNames: list):
     """
     Description:
-        Create a sentinel2 image cloud mask using the qa60 bitmask band.
+        Returns a dictionary from SPACECRAFT_ID ("default" for any other spacecraft) to the name of the bitmask of the collection.
     Arguments:
-        image           (ee.Image)  (mandatory): The image on which the cloud mask will be applied.
-        maskName        (str)       (mandatory): The name of the soon to be created mask.
-        providedOptions (list)      (mandatory): self-explanatory. Defaults to [cloud, cirrus].
+        collectionId    (str)   (mandatory): The system:id of the collection, None for merged collections.
+        bandNames       (list)  (mandatory): The band names of an image of the collection.
     Notes:
-        None.
+        -Raises a ValueError if none of the bands is a registered QA band.
     """
-    # remove possible duplicate values from providedOptions.
-    providedOptions = set(providedOptions)
+    for bandName, bitsNames in SENSOR_DETECTION.items():
+        if bandName not in bandNames:
+            continue
 
-    # check that all of the providedOptions values are available.
-    availableOptions = BITS_SENTINEL2_BQA.keys()
-    if all(option in providedOptions for option in availableOptions):
-        raise ValueError("One or more of the provided options are not available. Available options are: {}".format(availableOptions))
+        # a known collection holds images of a single spacecraft.
+        for prefix, spacecraftId in SPACECRAFT_DETECTION.items():
+            if collectionId is not None and collectionId.startswith(prefix):
+                return {"default": bitsNames.get(spacecraftId, bitsNames["default"])}
+        return bitsNames
 
-    # create a filtered dictionary from the providedOptions.
-    filteredOptions = {key: BITS_SENTINEL2_BQA[key] for key in providedOptions}
+    raise ValueError("None of the bands {} is a known QA band. Known QA bands are: {}".format(bandNames, list(SENSOR_DETECTION.keys())))
 
-    # check if no mask name was specified.
-    if maskName is None:
-        maskName = _cloud_mask_band_naming_convention(filteredOptions)
-
-    # comment.
-    operandsList = []
-    numberOfBitsList = []
-    for key, value in filteredOptions.items():
-        for innerKey, innerValue in value.items():
-            if "-" in innerKey:
-                splitKey = innerKey.split("-")
-                numberOfBits = splitKey[0]
-            else:
-                numberOfBits = innerKey
-
-            operandsList.append(innerValue)
-            numberOfBitsList.append(int(numberOfBits))
-
-    operandsList = ee.List(operandsList)
-    numberOfBitsList = ee.List(numberOfBitsList)
-    return _generic_cloud_mask_band_creation(image.select("QA60"), maskName, operandsList, numberOfBitsList)
 
+@initialization._ensure_initialized
+def _collection_cloud_mask_application(collection, providedOptions=None, nonValue: int = None, maskName: str = None, bitsNames: dict = None):
+    """
+    Description:
+        Masks the clouds of every image of a collection, detecting its sensor and QA band.
+    Arguments:
+        collection      (ee.ImageCollection)    (mandatory): self-explanatory.
+        providedOptions (list/dict)             (optional): The options for every bitmask (list) or per bitmask name (dict). Defaults to
+                                                            the "defaultOptions" of each bitmask in MASK_REGISTRY.
+        nonValue        (int)                   (optional): The value which will be applied at all positions where the mask is zero.
+                                                            Defaults to None.
+        maskName        (str)                   (optional): The name of the mask. Defaults to None.
+        bitsNames       (dict)                  (optional): A dictionary from SPACECRAFT_ID ("default" for any other spacecraft) to bitmask
+                                                            name, skipping the detection. Defaults to None.
+    Notes:
+        -The sensor is detected with a single getInfo of the collection id and of the band names of its first image (see SENSOR_DETECTION
+        and SPACECRAFT_DETECTION).
+        -Merged collections (e.g. Landsat 5, 7 and 8) are routed per image on the SPACECRAFT_ID property, within the same map.
+        -The mask specifications are compiled once, so the whole collection is masked by a single server-side map.
+        -Options provided as a list must be available in every routed bitmask (e.g. no cirrus options for merged Landsat 7 and 8).
+        -Example: _collection_cloud_mask_application(ee.ImageCollection("LANDSAT/LC08/C01/T1_TOA"), ["cloud"], nonValue=0).
+    """
+    if bitsNames is None:
+        collectionId, bandNames = instrumentation._get_info(ee.List([collection.get("system:id"), collection.first().bandNames()]))
+        bitsNames = _sensor_detector(collectionId, bandNames)
 
-def _sentinel2_sr(image, maskName: str = None, providedOptions: list = ('high_clouds_probability', 'cirrus', 'cloud_shadows')):
+    if maskName is None:
+        maskName = _cloud_mask_band_naming_convention(providedOptions)
+
+    # compile every specification on the client, before the map.
+    specifications = {}
+    for spacecraftId, bitsName in bitsNames.items():
+        if providedOptions is None:
+            options = MASK_REGISTRY[bitsName]["defaultOptions"]
+        elif isinstance(providedOptions, dict):
+            options = providedOptions.get(bitsName, MASK_REGISTRY[bitsName]["defaultOptions"])
+        else:
+            options = providedOptions
+        specifications[spacecraftId] = _mask_specification(bitsName, tuple(sorted(set(options))))
+
+    def _mask_creator(image, specification):
+        return _compiled_mask_band_creation(image.select(specification.bandName), maskName, specification)
+
+    def _inner_function(image):
+        mask = _mask_creator(image, specifications["default"])
+        for spacecraftId, specification in specifications.items():
+            if spacecraftId != "default":
+                isSpacecraft = ee.String(image.get("SPACECRAFT_ID")).equals(spacecraftId)
+                mask = ee.Image(ee.Algorithms.If(isSpacecraft, _mask_creator(image, specification), mask))
+        return _cloud_mask_application(mask, image, nonValue)
+
+    return collection.map(_inner_function)
+
+
+@initialization._ensure_initialized
+def _sentinel2_qa(image, maskName: str = None, providedOptions: list = None):
     """
     Description:
-        Create a sentinel2 image cloud mask using the slc bitmask band.
+        Create a sentinel2 image cloud mask using the qa60 bitmask band.
     Arguments:
         image           (ee.Image)  (mandatory): The image on which the cloud mask will be applied.
         maskName        (str)       (mandatory): The name of the soon to be created mask.
-        providedOptions (list)      (mandatory): self-explanatory. Defaults to [high_clouds_probability, cirrus, cloud_shadows].
+        providedOptions (list)      (optional): self-explanatory. Defaults to the "defaultOptions" of BITS_SENTINEL2_BQA in MASK_REGISTRY.
     Notes:
         None.
     """
-    # remove possible duplicate values from providedOptions.
-    providedOptions = set(providedOptions)
+    return _registered_cloud_mask_band_creation(image, "BITS_SENTINEL2_BQA", maskName, providedOptions)
 
-    # check that all of the providedOptions values are available.
-    availableOptions = BITS_SENTINEL2_SCL.keys()
-    if all(option in providedOptions for option in availableOptions):
-        raise ValueError("One or more of the provided options are not available. Available options are: {}".format(availableOptions))
-
-    # create a filtered dictionary from the providedOptions.
-    filteredOptions = {key: BITS_SENTINEL2_SCL[key] for key in providedOptions}
-
-    # check if no mask name was specified.
-    if maskName is None:
-        maskName = _cloud_mask_band_naming_convention(filteredOptions)
-
-    # comment.
-    operandsList = []
-    numberOfBitsList = []
-    for key, value in filteredOptions.items():
-        for innerKey, innerValue in value.items():
-            if "-" in innerKey:
-                splitKey = innerKey.split("-")
-                numberOfBits = splitKey[0]
-            else:
-                numberOfBits = innerKey
 
-            operandsList.append(innerValue)
-            numberOfBitsList.append(int(numberOfBits))
-
-    operandsList = ee.List(operandsList)
-    numberOfBitsList = ee.List(numberOfBitsList)
-    return _generic_cloud_mask_band_creation(image.select("SCL"), maskName, operandsList, numberOfBitsList)
-
-
-def _landsat457_toa(image, maskName: str = None, providedOptions: list = ('high_cloud_confidence', 'high_cloud_shadow_confidence')):
+@initialization._ensure_initialized
+def _sentinel2_sr(image, maskName: str = None, providedOptions: list = None):
     """
     Description:
-        Create a sentinel2 image cloud mask using the slc bitmask band.
+        Create a sentinel2 image cloud mask using the scl bitmask band.
     Arguments:
         image           (ee.Image)  (mandatory): The image on which the cloud mask will be applied.
         maskName        (str)       (mandatory): The name of the soon to be created mask.
-        providedOptions (list)      (mandatory): self-explanatory. Defaults to [high_cloud_confidence, high_cloud_shadow_confidence].
+        providedOptions (list)      (optional): self-explanatory. Defaults to the "defaultOptions" of BITS_SENTINEL2_SCL in MASK_REGISTRY.
     Notes:
         None.
     """
-    # remove possible duplicate values from providedOptions.
-    providedOptions = set(providedOptions)
-
-    # check that all of the providedOptions values are available.
-    availableOptions = BITS_LANDSAT_BQA.keys()
-    if all(option in providedOptions for option in availableOptions):
-        raise ValueError("One or more of the provided options are not available. Available options are: {}".format(availableOptions))
-
-    # create a filtered dictionary from the providedOptions.
-    filteredOptions = {key: BITS_LANDSAT_BQA[key] for key in providedOptions}
-
-    # check if no mask name was specified.
-    if maskName is None:
-        maskName = _cloud_mask_band_naming_convention(filteredOptions)
-
-    # comment.
-    operandsList = []
-    numberOfBitsList = []
-    for key, value in filteredOptions.items():
-        for innerKey, innerValue in value.items():
-            if "-" in innerKey:
-                splitKey = innerKey.split("-")
-                numberOfBits = splitKey[0]
-            else:
-                numberOfBits = innerKey
-
-            operandsList.append(innerValue)
-            numberOfBitsList.append(int(numberOfBits))
-
-    operandsList = ee.List(operandsList)
-    numberOfBitsList = ee.List(numberOfBitsList)
-    return _generic_cloud_mask_band_creation(image.select("BQA"), maskName, operandsList, numberOfBitsList)
+    return _registered_cloud_mask_band_creation(image, "BITS_SENTINEL2_SCL", maskName, providedOptions)
 
 
-def _cloud_qa_landsat457_sr(image, maskName: str = None, providedOptions: list = ('cloud', 'shadow')):
+@initialization._ensure_initialized
+def _landsat457_toa(image, maskName: str = None, providedOptions: list = None):
     """
     Description:
-        Create a sentinel2 image cloud mask using the slc bitmask band.
+        Create a landsat 4/5/7 toa image cloud mask using the bqa bitmask band.
     Arguments:
         image           (ee.Image)  (mandatory): The image on which the cloud mask will be applied.
         maskName        (str)       (mandatory): The name of the soon to be created mask.
-        providedOptions (list)      (mandatory): self-explanatory. Defaults to [cloud, shadow].
+        providedOptions (list)      (optional): self-explanatory. Defaults to the "defaultOptions" of BITS_LANDSAT_BQA in MASK_REGISTRY.
     Notes:
         None.
     """
-    # remove possible duplicate values from providedOptions.
-    providedOptions = set(providedOptions)
-
-    # check that all of the providedOptions values are available.
-    availableOptions = BITS_LANDSAT_CLOUD_QA.keys()
-    if all(option in providedOptions for option in availableOptions):
-        raise ValueError("One or more of the provided options are not available. Available options are: {}".format(availableOptions))
+    return _registered_cloud_mask_band_creation(image, "BITS_LANDSAT_BQA", maskName, providedOptions)
 
-    # create a filtered dictionary from the providedOptions.
-    filteredOptions = {key: BITS_LANDSAT_CLOUD_QA[key] for key in providedOptions}
 
-    # check if no mask name was specified.
-    if maskName is None:
-        maskName = _cloud_mask_band_naming_convention(filteredOptions)
-
-    # comment.
-    operandsList = []
-    numberOfBitsList = []
-    for key, value in filteredOptions.items():
-        for innerKey, innerValue in value.items():
-            if "-" in innerKey:
-                splitKey = innerKey.split("-")
-                numberOfBits = splitKey[0]
-            else:
-                numberOfBits = innerKey
-
-            operandsList.append(innerValue)
-            numberOfBitsList.append(int(numberOfBits))
-
-    operandsList = ee.List(operandsList)
-    numberOfBitsList = ee.List(numberOfBitsList)
-    return _generic_cloud_mask_band_creation(image.select("sr_cloud_qa"), maskName, operandsList, numberOfBitsList)
-
-
-def _pixel_qa_landsat457_sr(image, maskName: str = None, providedOptions: list = ('cloud', 'high_cloud_confidence', 'shadow')):
+@initialization._ensure_initialized
+def _cloud_qa_landsat457_sr(image, maskName: str = None, providedOptions: list = None):
     """
     Description:
-        Create a sentinel2 image cloud mask using the slc bitmask band.
+        Create a landsat 4/5/7 sr image cloud mask using the sr_cloud_qa bitmask band.
     Arguments:
         image           (ee.Image)  (mandatory): The image on which the cloud mask will be applied.
         maskName        (str)       (mandatory): The name of the soon to be created mask.
-        providedOptions (list)      (mandatory): self-explanatory. Defaults to [cloud, high_cloud_confidence, shadow].
+        providedOptions (list)      (optional): self-explanatory. Defaults to the "defaultOptions" of BITS_LANDSAT_CLOUD_QA in MASK_REGISTRY.
     Notes:
         None.
     """
-    # remove possible duplicate values from providedOptions.
-    providedOptions = set(providedOptions)
-
-    # check that all of the providedOptions values are available.
-    availableOptions = BITS_LANDSAT_PIXEL_QA.keys()
-    if all(option in providedOptions for option in availableOptions):
-        raise ValueError("One or more of the provided options are not available. Available options are: {}".format(availableOptions))
+    return _registered_cloud_mask_band_creation(image, "BITS_LANDSAT_CLOUD_QA", maskName, providedOptions)
 
-    # create a filtered dictionary from the providedOptions.
-    filteredOptions = {key: BITS_LANDSAT_PIXEL_QA[key] for key in providedOptions}
 
-    # check if no mask name was specified.
-    if maskName is None:
-        maskName = _cloud_mask_band_naming_convention(filteredOptions)
-
-    # comment.
-    operandsList = []
-    numberOfBitsList = []
-    for key, value in filteredOptions.items():
-        for innerKey, innerValue in value.items():
-            if "-" in innerKey:
-                splitKey = innerKey.split("-")
-                numberOfBits = splitKey[0]
-            else:
-                numberOfBits = innerKey
-
-            operandsList.append(innerValue)
-            numberOfBitsList.append(int(numberOfBits))
-
-    operandsList = ee.List(operandsList)
-    numberOfBitsList = ee.List(numberOfBitsList)
-    return _generic_cloud_mask_band_creation(image.select("pixel_qa"), maskName, operandsList, numberOfBitsList)
-
-
-def _landsat8_toa(image, maskName: str = None,
-                  providedOptions: list = ('high_cloud_confidence', 'high_cirrus_confidence', 'high_cloud_shadow_confidence')):
+@initialization._ensure_initialized
+def _pixel_qa_landsat457_sr(image, maskName: str = None, providedOptions: list = None):
     """
     Description:
-        Create a sentinel2 image cloud mask using the slc bitmask band.
+        Create a landsat 4/5/7 sr image cloud mask using the pixel_qa bitmask band.
     Arguments:
         image           (ee.Image)  (mandatory): The image on which the cloud mask will be applied.
         maskName        (str)       (mandatory): The name of the soon to be created mask.
-        providedOptions (list)      (mandatory): self-explanatory. Defaults to [high_cloud_confidence, high_cirrus_confidence, high_cloud_shadow_confidence].
+        providedOptions (list)      (optional): self-explanatory. Defaults to the "defaultOptions" of BITS_LANDSAT_PIXEL_QA in MASK_REGISTRY.
     Notes:
         None.
     """
-    # remove possible duplicate values from providedOptions.
-    providedOptions = set(providedOptions)
+    return _registered_cloud_mask_band_creation(image, "BITS_LANDSAT_PIXEL_QA", maskName, providedOptions)
 
-    # check that all of the providedOptions values are available.
-    availableOptions = BITS_LANDSAT_BQA_L8.keys()
-    if all(option in providedOptions for option in availableOptions):
-        raise ValueError("One or more of the provided options are not available. Available options are: {}".format(availableOptions))
-
-    # create a filtered dictionary from the providedOptions.
-    filteredOptions = {key: BITS_LANDSAT_BQA_L8[key] for key in providedOptions}
-
-    # check if no mask name was specified.
-    if maskName is None:
-        maskName = _cloud_mask_band_naming_convention(filteredOptions)
 
-    # comment.
-    operandsList = []
-    numberOfBitsList = []
-    for key, value in filteredOptions.items():
-        for innerKey, innerValue in value.items():
-            if "-" in innerKey:
-                splitKey = innerKey.split("-")
-                numberOfBits = splitKey[0]
-            else:
-                numberOfBits = innerKey
-
-            operandsList.append(innerValue)
-            numberOfBitsList.append(int(numberOfBits))
-
-    operandsList = ee.List(operandsList)
-    numberOfBitsList = ee.List(numberOfBitsList)
-    return _generic_cloud_mask_band_creation(image.select("BQA"), maskName, operandsList, numberOfBitsList)
-
-
-def _landsat8_sr(image, maskName: str = None, providedOptions: list = ("high_cloud_confidence", "high_cirrus_confidence")):
+@initialization._ensure_initialized
+def _landsat8_toa(image, maskName: str = None, providedOptions: list = None):
     """
     Description:
-        Create a sentinel2 image cloud mask using the slc bitmask band.
+        Create a landsat 8 toa image cloud mask using the bqa bitmask band.
     Arguments:
         image           (ee.Image)  (mandatory): The image on which the cloud mask will be applied.
         maskName        (str)       (mandatory): The name of the soon to be created mask.
-        providedOptions (list)      (mandatory): self-explanatory. Defaults to [high_cloud_confidence, high_cirrus_confidence].
+        providedOptions (list)      (optional): self-explanatory. Defaults to the "defaultOptions" of BITS_LANDSAT_BQA_L8 in MASK_REGISTRY.
     Notes:
         None.
     """
-    # remove possible duplicate values from providedOptions.
-    providedOptions = set(providedOptions)
+    return _registered_cloud_mask_band_creation(image, "BITS_LANDSAT_BQA_L8", maskName, providedOptions)
 
-    # check that all of the providedOptions values are available.
-    availableOptions = BITS_LANDSAT_PIXEL_QA_L8.keys()
-    if all(option in providedOptions for option in availableOptions):
-        raise ValueError("One or more of the provided options are not available. Available options are: {}".format(availableOptions))
 
-    # create a filtered dictionary from the providedOptions.
-    filteredOptions = {key: BITS_LANDSAT_PIXEL_QA_L8[key] for key in providedOptions}
+@initialization._ensure_initialized
+def _landsat8_sr(image, maskName: str = None, providedOptions: list = None):
+    """
+    Description:
+        Create a landsat 8 sr image cloud mask using the pixel_qa bitmask band.
+    Arguments:
+        image           (ee.Image)  (mandatory): The image on which the cloud mask will be applied.
+        maskName        (str)       (mandatory): The name of the soon to be created mask.
+        providedOptions (list)      (optional): self-explanatory. Defaults to the "defaultOptions" of BITS_LANDSAT_PIXEL_QA_L8 in MASK_REGISTRY.
+    Notes:
+        None.
+    """
+    return _registered_cloud_mask_band_creation(image, "BITS_LANDSAT_PIXEL_QA_L8", maskName, providedOptions)
 
-    # check if no mask name was specified.
-    if maskName is None:
-        maskName = _cloud_mask_band_naming_convention(filteredOptions)
 
-    # comment.
-    operandsList = []
-    numberOfBitsList = []
-    for key, value in filteredOptions.items():
-        for innerKey, innerValue in value.items():
-            if "-" in innerKey:
-                splitKey = innerKey.split("-")
-                numberOfBits = splitKey[0]
-            else:
-                numberOfBits = innerKey
+def _mask_registry_validator():
+    """
+    Description:
+        Compiles every option and the default options of every registered bitmask.
+    Arguments:
+        None.
+    Notes:
+        -Called once at import, so a malformed bit range or an unknown default option in MASK_REGISTRY raises a ValueError there rather
+        than on first use. The compiled specifications are cached as well (see _mask_specification).
+    """
+    for bitsName, registration in MASK_REGISTRY.items():
+        for option in registration["bits"]:
+            _mask_specification(bitsName, (option,))
+        _mask_specification(bitsName, tuple(sorted(set(registration["defaultOptions"]))))
 
-            operandsList.append(innerValue)
-            numberOfBitsList.append(int(numberOfBits))
 
-    operandsList = ee.List(operandsList)
-    numberOfBitsList = ee.List(numberOfBitsList)
-    return _generic_cloud_mask_band_creation(image.select("pixel_qa"), maskName, operandsList, numberOfBitsList)
+_mask_registry_validator()
@@ -0,0 +1,14 @@
+import os
+import sys
+
+"""
+Registers the offline stand-in for Earth Engine (see benchmarks/fake_ee.py) as "ee" before any test imports geetils, so the tests need
+neither an Earth Engine account nor network access.
+"""
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "benchmarks"))
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import fake_ee  # noqa: E402
+
+BACKEND = fake_ee.install()
@@ -0,0 +1,74 @@
+import datetime
+import zoneinfo
+import pytest
+from geetils import date
+
+"""
+Pure Python tests of the client side date ranges of the date module, which need no server interaction.
+"""
+
+
+def _ranges(startDate, endDate, interval=1, unit="month", timeZone="UTC"):
+    # the (start, end) pairs as ISO 8601 strings in timeZone.
+    zone = zoneinfo.ZoneInfo(timeZone)
+    return [tuple(datetime.datetime.fromtimestamp(millis / 1000, zone).isoformat() for millis in dateRange)
+            for dateRange in date._client_date_range_creator(startDate, endDate, interval, unit, timeZone)]
+
+
+def test_whole_calendar_units_are_counted():
+    # the server truncates these to no range, as February 2020 and the year 2019 are shorter than an average month and year.
+    assert _ranges("2020-02-01", "2020-03-01") == [("2020-02-01T00:00:00+00:00", "2020-03-01T00:00:00+00:00")]
+    assert _ranges("2019-01-01", "2020-01-01", unit="year") == [("2019-01-01T00:00:00+00:00", "2020-01-01T00:00:00+00:00")]
+
+
+def test_partial_last_range_is_dropped():
+    assert _ranges("2020-01-01", "2020-02-29") == [("2020-01-01T00:00:00+00:00", "2020-02-01T00:00:00+00:00")]
+    assert _ranges("2020-01-01", "2020-01-31") == []
+
+
+def test_month_end_ranges_are_contiguous():
+    assert _ranges("2020-01-31", "2020-05-01") == [("2020-01-31T00:00:00+00:00", "2020-02-29T00:00:00+00:00"),
+                                                   ("2020-02-29T00:00:00+00:00", "2020-03-31T00:00:00+00:00"),
+                                                   ("2020-03-31T00:00:00+00:00", "2020-04-30T00:00:00+00:00")]
+
+
+def test_leap_day_is_clamped_in_common_years():
+    assert _ranges("2020-02-29", "2024-03-01", unit="year") == [("2020-02-29T00:00:00+00:00", "2021-02-28T00:00:00+00:00"),
+                                                                ("2021-02-28T00:00:00+00:00", "2022-02-28T00:00:00+00:00"),
+                                                                ("2022-02-28T00:00:00+00:00", "2023-02-28T00:00:00+00:00"),
+                                                                ("2023-02-28T00:00:00+00:00", "2024-02-29T00:00:00+00:00")]
+
+
+def test_days_keep_the_wall_clock_across_daylight_saving_time():
+    dateRanges = _ranges("2021-03-27", "2021-03-30", unit="day", timeZone="Europe/Athens")
+    assert dateRanges == [("2021-03-27T00:00:00+02:00", "2021-03-28T00:00:00+02:00"),
+                          ("2021-03-28T00:00:00+02:00", "2021-03-29T00:00:00+03:00"),
+                          ("2021-03-29T00:00:00+03:00", "2021-03-30T00:00:00+03:00")]
+
+    # the day of the change lasts 23 hours.
+    durations = [end - start for start, end in date._client_date_range_creator("2021-03-27", "2021-03-30", 1, "day", "Europe/Athens")]
+    assert durations == [24 * 3600 * 1000, 23 * 3600 * 1000, 24 * 3600 * 1000]
+
+
+def test_hours_are_exact_durations_across_daylight_saving_time():
+    dateRanges = _ranges("2021-03-28T02:00", "2021-03-28T05:00", unit="hour", timeZone="Europe/Athens")
+    assert dateRanges == [("2021-03-28T02:00:00+02:00", "2021-03-28T04:00:00+03:00"),
+                          ("2021-03-28T04:00:00+03:00", "2021-03-28T05:00:00+03:00")]
+
+
+def test_ranges_end_by_the_end_date_when_clocks_go_back():
+    # 03:00 to 04:00 happens twice, at +03:00 and then at +02:00. The end date is the first 03:30, so the second hour, which ends at
+    # the second 03:00, ends after it although its wall clock time is earlier.
+    dateRanges = _ranges("2021-10-31T02:00", "2021-10-31T03:30", unit="hour", timeZone="Europe/Athens")
+    assert dateRanges == [("2021-10-31T02:00:00+03:00", "2021-10-31T03:00:00+03:00")]
+
+    endMillis = date._date_parser("2021-10-31T03:30", "Europe/Athens").timestamp() * 1000
+    assert all(end <= endMillis for _, end in date._client_date_range_creator("2021-10-31T02:00", "2021-10-31T03:30", 1, "hour",
+                                                                             "Europe/Athens"))
+
+
+def test_invalid_arguments_raise():
+    with pytest.raises(ValueError):
+        date._client_date_range_creator("2020-01-01", "2021-01-01", 1, "fortnight")
+    with pytest.raises(ValueError):
+        date._client_date_range_creator("2020-01-01", "2021-01-01", 0, "month")
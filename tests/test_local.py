@@ -0,0 +1,82 @@
+import os
+import sys
+import subprocess
+import numpy as np
+import pytest
+from geetils import local, masking
+
+"""
+Pure NumPy tests of the compiled bitmask specifications and of their local decoding, on hand-built QA values.
+"""
+
+
+def _qa(*bitsList):
+    # a QA value with the provided (first bit, value) pairs set.
+    return sum(value << firstBit for firstBit, value in bitsList)
+
+
+def test_mask_compiler_splits_flags_and_fields():
+    # a single bit set to 1 is a flag, a multi-bit range or a single bit set to 0 is a field.
+    flags, fields = masking._mask_compiler([1, 3, 0, 2], [3, 5, 4, 9], [3, 6, 4, 10])
+    assert flags == 1 << 3
+    assert fields == ((5, 0b11, 3), (4, 0b1, 0), (9, 0b11, 2))
+
+
+@pytest.mark.parametrize("operandsList, numberOfBitsList, lastBitsList", [([4], [5], [6]), ([1], [6], [5]), ([-1], [2], [2])])
+def test_mask_compiler_rejects_invalid_ranges(operandsList, numberOfBitsList, lastBitsList):
+    with pytest.raises(ValueError):
+        masking._mask_compiler(operandsList, numberOfBitsList, lastBitsList)
+
+
+def test_single_bit_flags():
+    # BITS_SENTINEL2_BQA: cloud is bit 10, cirrus is bit 11.
+    qaArray = np.array([[0, _qa((10, 1))], [_qa((11, 1)), _qa((10, 1), (11, 1))]], dtype=np.uint16)
+    mask = local._local_cloud_mask(qaArray, "BITS_SENTINEL2_BQA", ["cloud", "cirrus"])
+    assert mask.tolist() == [[True, False], [False, False]]
+
+    mask = local._local_cloud_mask(qaArray, "BITS_SENTINEL2_BQA", ["cloud"])
+    assert mask.tolist() == [[True, False], [True, False]]
+
+
+def test_multi_bit_fields():
+    # BITS_LANDSAT_BQA: the cloud confidence is bits 5-6, high being 3, and the cloud shadow confidence is bits 7-8.
+    qaValues = [_qa((5, confidence)) for confidence in range(4)] + [_qa((5, 3), (7, 3)), _qa((7, 3)), _qa((4, 1), (5, 2))]
+    qaArray = np.array(qaValues, dtype=np.uint16)
+
+    mask = local._local_cloud_mask(qaArray, "BITS_LANDSAT_BQA", ["high_cloud_confidence"])
+    assert mask.tolist() == [True, True, True, False, False, True, True]
+
+    mask = local._local_cloud_mask(qaArray, "BITS_LANDSAT_BQA", ["medium_cloud_confidence", "high_cloud_shadow_confidence"])
+    assert mask.tolist() == [True, True, False, True, False, False, False]
+
+
+def test_flags_and_fields_combined():
+    # BITS_LANDSAT_PIXEL_QA_L8: cloud is bit 5, the cirrus confidence is bits 8-9.
+    qaArray = np.array([0, _qa((5, 1)), _qa((8, 3)), _qa((8, 2)), _qa((5, 1), (8, 3))], dtype=np.uint16)
+    mask = local._local_cloud_mask(qaArray, "BITS_LANDSAT_PIXEL_QA_L8", ["cloud", "high_cirrus_confidence"])
+    assert mask.tolist() == [True, False, False, True, False]
+
+
+def test_chunked_decoding_matches_a_bit_by_bit_reference():
+    specification = masking._mask_specification("BITS_LANDSAT_BQA", ("cloud", "high_cloud_confidence", "low_snow_confidence"))
+    qaArray = np.arange(2 ** 12, dtype=np.uint16).reshape(64, 64)
+
+    # the reference decodes each value with plain integer arithmetic, bit range by bit range.
+    reference = np.array([[not (value & specification.flags) and
+                           all(((value >> firstBit) & widthMask) != operand for firstBit, widthMask, operand in specification.fields)
+                           for value in row] for row in qaArray.tolist()])
+
+    assert np.array_equal(local._local_mask_band_creation(qaArray, specification, chunkSize=1000), reference)
+
+
+def test_non_integer_qa_band_raises():
+    with pytest.raises(ValueError):
+        local._local_cloud_mask(np.zeros((2, 2), dtype=np.float32), "BITS_SENTINEL2_BQA")
+
+
+def test_mask_decoding_does_not_import_rasterio():
+    # rasterio is only needed to ingest downloads (see local._zip_to_memory_map), checked in a fresh interpreter.
+    rootPath = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    code = ("import sys; sys.path[:0] = [{!r}, {!r}]; import fake_ee; fake_ee.install(); import geetils.local; "
+            "sys.exit('rasterio' in sys.modules)").format(rootPath, os.path.join(rootPath, "benchmarks"))
+    assert subprocess.run([sys.executable, "-c", code]).returncode == 0
@@ -0,0 +1,96 @@
+import time
+import pytest
+import fake_ee
+from geetils.batch import scheduler
+
+"""
+Offline tests of the export task scheduler against the fake Earth Engine API (see benchmarks/fake_ee.py).
+"""
+
+ee = fake_ee.ee
+BACKEND = fake_ee.BACKEND
+
+
+@pytest.fixture(autouse=True)
+def _backend():
+    BACKEND.reset()
+    BACKEND.responder = lambda callName, node: None
+    yield
+    BACKEND.responder = lambda callName, node: None
+
+
+def _tasks(*descriptions):
+    return [ee.batch.Export.image.toAsset(ee.Image("COPERNICUS/S2/20190101"), description=description) for description in descriptions]
+
+
+def _rejecting_responder(rejectedDescriptions, attemptsList):
+    # rejects the start of the export tasks with the provided descriptions, as the server does e.g. for an existing asset.
+    def _responder(callName, node):
+        if callName == "Task.start" and node.kwargs["description"] in rejectedDescriptions:
+            attemptsList.append(node.kwargs["description"])
+            raise ee.EEException("Cannot overwrite asset")
+        return None
+    return _responder
+
+
+def test_completed_tasks_are_finished():
+    taskScheduler = scheduler._ExportTaskScheduler(_tasks("a", "b", "c"), maxConcurrentTasks=2, pollingInterval=0.01)
+
+    assert taskScheduler.wait(5)
+    assert taskScheduler.progress() == {"PENDING": 0, "ACTIVE": 0, "COMPLETED": 3}
+    assert len(taskScheduler.task_ids()) == 3
+    assert taskScheduler.start_errors() == []
+
+
+def test_rejected_start_does_not_block_the_queue():
+    attemptsList = []
+    BACKEND.responder = _rejecting_responder({"bad"}, attemptsList)
+    exportTasksList = _tasks("bad", "a", "b", "c")
+    taskScheduler = scheduler._ExportTaskScheduler(exportTasksList, pollingInterval=0.01, maxStartAttempts=3)
+
+    assert taskScheduler.wait(5)
+    assert taskScheduler.progress() == {"PENDING": 0, "ACTIVE": 0, "COMPLETED": 3, "FAILED_TO_START": 1}
+    assert len(taskScheduler.task_ids()) == 3
+    assert taskScheduler.start_errors() == [(exportTasksList[0], "Cannot overwrite asset")]
+    assert attemptsList == ["bad"] * 3
+
+
+def _wait_until_active(taskScheduler, count):
+    for _ in range(500):
+        if taskScheduler.progress()["ACTIVE"] == count:
+            return
+        time.sleep(0.01)
+    raise AssertionError("The export tasks were not started")
+
+
+def test_cancel_drops_pending_and_cancels_active_tasks():
+    taskScheduler = scheduler._ExportTaskScheduler(_tasks("a", "b", "c"), maxConcurrentTasks=2, pollingInterval=60)
+    _wait_until_active(taskScheduler, 2)
+    for exportTaskId in taskScheduler.task_ids():
+        BACKEND.tasks[exportTaskId]["state"] = "RUNNING"
+
+    taskScheduler.cancel()
+
+    assert taskScheduler.done()
+    assert taskScheduler.progress() == {"PENDING": 0, "ACTIVE": 0, "CANCELLED": 2}
+    assert all(BACKEND.tasks[exportTaskId]["state"] == "CANCELLED" for exportTaskId in taskScheduler.task_ids())
+
+
+def test_cancel_keeps_the_state_of_tasks_that_completed_meanwhile(monkeypatch):
+    taskScheduler = scheduler._ExportTaskScheduler(_tasks("a", "b"), pollingInterval=60)
+    _wait_until_active(taskScheduler, 2)
+    completedTaskId, runningTaskId = taskScheduler.task_ids()
+    BACKEND.tasks[runningTaskId]["state"] = "RUNNING"
+
+    # the server rejects the cancellation of an export task that has already completed.
+    originalCancel = fake_ee._Task.cancel
+
+    def _cancel(exportTask):
+        if BACKEND.tasks[exportTask.id]["state"] == "COMPLETED":
+            raise ee.EEException("Task {} is already completed".format(exportTask.id))
+        originalCancel(exportTask)
+
+    monkeypatch.setattr(fake_ee._Task, "cancel", _cancel)
+    taskScheduler.cancel()
+
+    assert taskScheduler.finishedTasks == {completedTaskId: "COMPLETED", runningTaskId: "CANCELLED"}